@@ -108,8 +108,7 @@ def parse_resume(file) -> dict:
     text = ""
     try:
         with fitz.open(stream=raw_bytes, filetype="pdf") as doc:
-            for page in doc:
-                text += page.get_text("text") + "\n"
+            text = "".join([page.get_text("text", sort=True) + "\n" for page in doc])
     except Exception:
         # fallback: try decode bytes
         try:
@@ -1,5 +1,9 @@
 import uvicorn
+import asyncio
+import functools
 import os
+import json
+import tempfile
 from fastapi import FastAPI, UploadFile, Form, Body
 from core import parse_resume, extract_job_skills, analyze_skill_match, generate_llm_recommendations, format_for_ui_and_pdf, export_to_pdf, get_description_from_db, calculate_ats_score
 from fastapi.responses import FileResponse, HTMLResponse, StreamingResponse, JSONResponse
@@ -8,21 +12,46 @@ from typing import List
 import os as _os
 
 from schemas import GenerateResumeRequest
-from parser import parse_resume_upload, parse_resume_from_path
+from parser import parse_resume_upload, parse_resume_uploads, parse_resume_from_path
 from render import render_html_from_data, render_pdf_from_template, render_pdf_placeholder
 
 app = FastAPI()
-temp_storage = {}
+
+# The last analysis is kept on disk rather than in a module-level dict so that
+# /export-pdf still finds it when requests land on different uvicorn workers.
+LAST_RESULT_PATH = os.path.join(tempfile.gettempdir(), "optiresume_last_result.json")
+
+
+def _save_last_result(formatted: dict) -> None:
+    fd, tmp_path = tempfile.mkstemp(suffix=".json", dir=os.path.dirname(LAST_RESULT_PATH))
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(formatted, f)
+    os.replace(tmp_path, LAST_RESULT_PATH)
+
+
+def _load_last_result() -> dict | None:
+    try:
+        with open(LAST_RESULT_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+@functools.lru_cache(maxsize=256)
+def _cached_job_description(job_role: str) -> str:
+    """Job roles come from a small fixed set, so the description lookup is memoized per process."""
+    return get_description_from_db(job_role)
 
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=[
-        "http://localhost:3000",
-        "http://localhost:8080", 
-        "http://localhost:5173",
-        "https://optiresume-aidrivenresumeoptimizationandcare-production.up.railway.app",
-        "*"  # Allow all origins for development
-    ],
+    # Local dev servers plus the production deployment; set CORS_ORIGIN_REGEX for other hosts
+    # (preview deployments etc.). Credentials are allowed, so the default must not match
+    # shared hosting domains like *.vercel.app that anyone can deploy to.
+    allow_origin_regex=os.environ.get(
+        "CORS_ORIGIN_REGEX",
+        r"http://(localhost|127\.0\.0\.1)(:\d+)?"
+        r"|https://optiresume-aidrivenresumeoptimizationandcare-production\.up\.railway\.app",
+    ),
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
     allow_headers=["*"],
@@ -45,7 +74,7 @@ async def analyze_resume_options():
 async def analyze_resume(file: UploadFile, job_role: str = Form(...), job_description: str = Form(None)):
     resume_data = parse_resume(file)
     if not job_description:
-        job_description = get_description_from_db(job_role)
+        job_description = _cached_job_description(job_role)
     required_skills = extract_job_skills(job_description)
     match_info = analyze_skill_match(resume_data, required_skills)
     
@@ -55,7 +84,7 @@ async def analyze_resume(file: UploadFile, job_role: str = Form(...), job_descri
     recommendations = generate_llm_recommendations(resume_data, job_description, match_info)
     formatted = format_for_ui_and_pdf(match_info, recommendations, ats_data)
     
-    temp_storage["last_result"] = formatted 
+    _save_last_result(formatted)
 
     return {
         "result": formatted
@@ -67,7 +96,7 @@ async def export_pdf_options():
 
 @app.get("/export-pdf")
 async def export_pdf():
-    formatted_data = temp_storage.get("last_result")
+    formatted_data = _load_last_result()
     if not formatted_data:
         return {"error": "No analysis result available to export."}
 
@@ -80,20 +109,37 @@ async def export_pdf():
 
 # ---------------- BuildCV endpoints ----------------
 
-@app.get("/templates")
-async def list_templates():
-    # Look for LaTeX templates in backend/templates and root templates/
+# Look for LaTeX templates in backend/templates and root templates/
+TEMPLATE_DIRS = (
+    _os.path.join(_os.path.dirname(__file__), "templates"),
+    _os.path.join(_os.path.dirname(_os.path.dirname(__file__)), "templates"),
+)
+
+
+def _dir_mtime_ns(d: str) -> int | None:
+    try:
+        return _os.stat(d).st_mtime_ns
+    except OSError:
+        return None
+
+
+@functools.lru_cache(maxsize=1)
+def _scan_templates(dir_mtimes: tuple) -> tuple:
+    """List .tex files across TEMPLATE_DIRS. Keyed on the directories' mtimes, which change
+    whenever a file is added, removed or renamed, so a stale listing is never served."""
     candidates: List[str] = []
-    root_templates = _os.path.join(_os.path.dirname(_os.path.dirname(__file__)), "templates")
-    backend_templates = _os.path.join(_os.path.dirname(__file__), "templates")
-    for d in [backend_templates, root_templates]:
+    for d in TEMPLATE_DIRS:
         if _os.path.isdir(d):
             for f in _os.listdir(d):
                 if f.endswith(".tex"):
                     candidates.append(f)
     # De-duplicate while preserving order
-    seen = set()
-    unique = [x for x in candidates if not (x in seen or seen.add(x))]
+    return tuple(dict.fromkeys(candidates))
+
+
+@app.get("/templates")
+async def list_templates():
+    unique = list(_scan_templates(tuple(_dir_mtime_ns(d) for d in TEMPLATE_DIRS)))
     return {"templates": unique or ["modern.tex", "classic.tex", "professional.tex"]}
 
 
@@ -103,13 +149,20 @@ async def upload_resume(file: UploadFile):
     return JSONResponse(parsed)
 
 
+@app.post("/upload_resumes")
+async def upload_resumes(files: List[UploadFile]):
+    """Parse several resumes in one request; each result also carries its filename."""
+    parsed = await parse_resume_uploads(files)
+    return JSONResponse({"results": parsed})
+
+
 @app.post("/upload_resume_path")
 async def upload_resume_path(payload: dict = Body(...)):
     """DEV convenience: parse a resume from a local file path on the server machine.
     Expects JSON body: { "file_path": "C:\\path\\to\\resume.pdf" }
     """
     file_path = (payload or {}).get("file_path", "")
-    data = parse_resume_from_path(file_path)
+    data = await asyncio.to_thread(parse_resume_from_path, file_path)
     return JSONResponse(data)
 
 
@@ -125,4 +178,14 @@ async def generate_resume(req: GenerateResumeRequest):
 
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", 8000))
-    uvicorn.run("main:app", host="0.0.0.0", port=port)
\ No newline at end of file
+    # "auto" resolves to uvloop/httptools when they are installed (uvloop has no
+    # Windows build) and falls back to asyncio/h11 otherwise.
+    # In production prefer: gunicorn -k uvicorn.workers.UvicornWorker -w 4 main:app
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=port,
+        loop="auto",
+        http="auto",
+        workers=int(os.environ.get("WEB_CONCURRENCY", 4)),
+    )
\ No newline at end of file
@@ -1,8 +1,13 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, IO, Optional
 from fastapi import UploadFile
+import asyncio
 import re
+from itertools import islice
 import io
 import os
+import shutil
+import string
+import tempfile
 
 try:
     import fitz  # PyMuPDF
@@ -15,9 +20,16 @@ try:
     DOCX_AVAILABLE = True
 except ImportError:
     DOCX_AVAILABLE = False
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
 try:
     import spacy
-    _NLP = spacy.load("en_core_web_md")
+    # Only the entity recognizer is used here; skip the components that would still run per token
+    _NLP = spacy.load("en_core_web_md", disable=["tagger", "parser", "lemmatizer", "attribute_ruler"])
     SPACY_AVAILABLE = True
 except Exception:
     _NLP = None
@@ -29,89 +41,185 @@ DEGREE_KEYWORDS = [
     "b.e.", "m.e.", "mba", "bachelors", "masters", "doctorate"
 ]
 
-DATE_PATTERN = r"((Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Sept|Oct|Nov|Dec)[a-z]*\s+\d{4}|\d{4})"
+# Upper bound on characters handed to spaCy; contact details and names sit near the top
+SPACY_MAX_CHARS = 20000
+SPACY_BATCH_SIZE = 8
+# Contact details live near the top, so the NER fallback only needs the first page or so
+SPACY_FALLBACK_CHARS = 10000
+
+# PDF uploads up to this size are parsed from memory; larger ones are copied to a temp file
+# in UPLOAD_CHUNK_BYTES chunks and opened by path so PyMuPDF reads them from disk.
+UPLOAD_IN_MEMORY_MAX_BYTES = 5 * 1024 * 1024
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+# Upload types _extract_upload_file can read
+UPLOAD_EXTENSIONS = ('.pdf', '.doc', '.docx')
 
+# Section descriptions in the parsed output are cut to this many characters plus "..."
+SECTION_PREVIEW_CHARS = 200
 
+DATE_PATTERN = r"((Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Sept|Oct|Nov|Dec)[a-z]*\s+\d{4}|\d{4})"
 
-def extract_text_from_pdf(content: bytes) -> str:
-    """Extract text from PDF using PyMuPDF"""
+# Patterns used on every parse, compiled once at import
+_DATE_RE = re.compile(DATE_PATTERN, re.IGNORECASE)
+_EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+_PHONE_RES = [
+    re.compile(r'\+?\d{1,3}[\s-]?\(?\d{2,4}\)?[\s-]?\d{3,4}[\s-]?\d{3,4}'),  # International/India like +91 98908 12345
+    re.compile(r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'),  # US formats
+    re.compile(r'\d{3}[-.\s]?\d{3}[-.\s]?\d{4}'),
+]
+_LINKEDIN_RES = [
+    re.compile(r'https?://(?:www\.)?linkedin\.com/in/[A-Za-z0-9\-_/]+'),
+    re.compile(r'(?<!\w)(?:www\.)?linkedin\.com/in/[A-Za-z0-9\-_/]+'),
+    re.compile(r'(?<!\w)linkedin\.com/in/[A-Za-z0-9\-_/]+'),
+]
+_GITHUB_RES = [
+    re.compile(r'https?://(?:www\.)?github\.com/[A-Za-z0-9\-_/]+'),
+    re.compile(r'(?<!\w)(?:www\.)?github\.com/[A-Za-z0-9\-_/]+'),
+]
+_CITY_RE = re.compile(r"\b([A-Z][a-zA-Z]+,\s*[A-Z][a-zA-Z]+)\b")
+_CONTACT_LINE_RE = re.compile(r"@|linkedin|github|phone|\+\d|mailto|http", re.I)
+_SPLIT_WS = re.compile(r"\s+")
+_NAME_TOKEN_RE = re.compile(r"^[A-Z][a-zA-Z\-\.]+$")
+_NAME_CHARS_RE = re.compile(r"^[A-Za-z\-\.]+$")
+
+
+# str.translate table for _sanitize_name over ASCII: keeps letters, '-' and whitespace (so tokens
+# still split) and deletes everything else. Non-ASCII input gets a separate pass in _sanitize_name.
+_NAME_KEEP = frozenset(string.ascii_letters + "-")
+_NAME_TRANS = str.maketrans("", "", "".join(
+    chr(i) for i in range(128) if chr(i) not in _NAME_KEEP and not chr(i).isspace()
+))
+# Section header keywords, matched as plain substrings of the lowercased line
+_EXP_KEYWORDS = ('experience', 'employment', 'work history')
+_EDU_KEYWORDS = ('education', 'academic', 'qualifications', 'degrees')
+_NAME_SEPARATORS_RE = re.compile(r'[._-]+')
+_FILE_EXT_RE = re.compile(r'\.[A-Za-z0-9]+$')
+
+
+
+def _text_and_name_from_doc(doc) -> tuple[str, str]:
+    """Full text of an open fitz document plus the largest-font name candidate.
+    Only the first two pages need span sizes for the name, so they go through the text dict;
+    the rest are read as text blocks, which yields the same text without building span dicts.
+    Blocks are sorted top-to-bottom, left-to-right so multi-column layouts read in order."""
+    parts: List[str] = []
+    best = (0.0, "")  # (size, text) over the first two pages
+    font_pages = min(2, doc.page_count)
+    for i in range(font_pages):
+        page = doc.load_page(i)
+        # Text flags rather than the dict defaults: those include TEXT_PRESERVE_IMAGES, which
+        # would copy every embedded photo/logo into the dict although only spans are read
+        for block in page.get_text("dict", flags=fitz.TEXTFLAGS_TEXT, sort=True).get("blocks", []):
+            for line in block.get("lines", []):
+                for span in line.get("spans", []):
+                    raw = span.get("text", "")
+                    parts.append(raw)
+                    txt = raw.strip()
+                    size = float(span.get("size", 0))
+                    if txt and size > best[0] and 2 <= len(txt) <= 60:
+                        best = (size, txt)
+                parts.append("\n")
+    # Not get_text("text", sort=True): in text mode sort also re-joins lines across blocks,
+    # which costs several times a dict pass. Sorted blocks keep the order used above.
+    for i in range(font_pages, doc.page_count):
+        parts.extend([block[4] for block in doc.load_page(i).get_text("blocks", flags=fitz.TEXTFLAGS_TEXT, sort=True)])
+    candidate = best[1]
+    return "".join(parts), candidate if _looks_like_name(candidate) else ""
+
+
+def extract_text_and_name_from_pdf(content: bytes) -> tuple[str, str]:
+    """Return (full text, font-based name) from a single open of the PDF."""
     if not PYMUPDF_AVAILABLE:
-        return "PDF parsing not available - PyMuPDF not installed"
-    
+        return "PDF parsing not available - PyMuPDF not installed", ""
     try:
-        doc = fitz.open(stream=content, filetype="pdf")
-        text = ""
-        for page in doc:
-            text += page.get_text()
-        doc.close()
-        return text
+        with fitz.open(stream=content, filetype="pdf") as doc:
+            return _text_and_name_from_doc(doc)
     except Exception as e:
-        return f"Error parsing PDF: {str(e)}"
+        return f"Error parsing PDF: {str(e)}", ""
 
 
-def extract_name_by_font_from_pdf(content: bytes) -> str:
-    """Use PyMuPDF text dict to get the largest-font text near the top, which is usually the name."""
+def _parse_pdf_path(path: str) -> tuple[str, str]:
+    """Like extract_text_and_name_from_pdf, but lets PyMuPDF read the file from disk itself."""
     if not PYMUPDF_AVAILABLE:
-        return ""
+        return "PDF parsing not available - PyMuPDF not installed", ""
     try:
-        doc = fitz.open(stream=content, filetype="pdf")
-        best = (0.0, "")  # (size, text)
-        pages_to_scan = min(2, doc.page_count)
-        for i in range(pages_to_scan):
-            p = doc.load_page(i)
-            d = p.get_text("dict")
-            for block in d.get("blocks", []):
-                for line in block.get("lines", []):
-                    for span in line.get("spans", []):
-                        txt = span.get("text", "").strip()
-                        size = float(span.get("size", 0))
-                        if txt and size > best[0] and 2 <= len(txt) <= 60:
-                            best = (size, txt)
-        doc.close()
-        candidate = best[1]
-        # If the largest text is multi-word and looks like a name, accept
-        return candidate if _looks_like_name(candidate) else ""
-    except Exception:
-        return ""
+        with fitz.open(path) as doc:
+            return _text_and_name_from_doc(doc)
+    except Exception as e:
+        return f"Error parsing PDF: {str(e)}", ""
 
 
-def extract_text_from_docx(content: bytes) -> str:
-    """Extract text from DOCX using python-docx"""
+def extract_text_from_docx(content) -> str:
+    """Extract text from DOCX using python-docx. Accepts raw bytes, a file path or a binary file object."""
     if not DOCX_AVAILABLE:
         return "DOCX parsing not available - python-docx not installed"
     
     try:
-        doc = Document(io.BytesIO(content))
-        text = ""
-        for paragraph in doc.paragraphs:
-            text += paragraph.text + "\n"
-        return text
+        doc = Document(io.BytesIO(content) if isinstance(content, (bytes, bytearray)) else content)
+        return "".join([paragraph.text + "\n" for paragraph in doc.paragraphs])
     except Exception as e:
         return f"Error parsing DOCX: {str(e)}"
 
 
 def extract_email(text: str) -> str:
     """Extract email from text"""
-    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-    match = re.search(email_pattern, text)
+    match = _EMAIL_RE.search(text)
     return match.group(0) if match else ""
 
 
 def extract_phone(text: str) -> str:
     """Extract phone number from text"""
-    phone_patterns = [
-        r'\+?\d{1,3}[\s-]?\(?\d{2,4}\)?[\s-]?\d{3,4}[\s-]?\d{3,4}',  # International/India like +91 98908 12345
-        r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}',  # US formats
-        r'\d{3}[-.\s]?\d{3}[-.\s]?\d{4}',
-    ]
-    
-    for pattern in phone_patterns:
-        match = re.search(pattern, text)
+    for pattern in _PHONE_RES:
+        match = pattern.search(text)
         if match:
             return match.group(0)
     return ""
 
 
+def extract_linkedin(text: str) -> str:
+    """Extract LinkedIn profile, with or without protocol."""
+    for p in _LINKEDIN_RES:
+        m = p.search(text)
+        if m:
+            url = m.group(0)
+            if not url.startswith('http'):
+                url = 'https://' + url.lstrip()
+            return url
+    return ""
+
+
+def extract_github(text: str) -> str:
+    """Extract GitHub URL with or without protocol."""
+    for p in _GITHUB_RES:
+        m = p.search(text)
+        if m:
+            url = m.group(0)
+            if not url.startswith('http'):
+                url = 'https://' + url
+            return url
+    return ""
+
+
+def extract_city(text: str) -> str:
+    """Find a simple "City, Country" pair, used as a location fallback."""
+    match = _CITY_RE.search(text)
+    return match.group(1) if match else ""
+
+
+def extract_contacts(text: str) -> Dict[str, str]:
+    """Email, phone, LinkedIn, GitHub and a "City, Country" pair ("" when absent).
+    Each field is its own precompiled search: that is faster than one combined alternation
+    whenever a field is missing, because the alternation then retries at every position."""
+    text = text or ""
+    return {
+        "email": extract_email(text),
+        "phone": extract_phone(text),
+        "linkedin": extract_linkedin(text),
+        "github": extract_github(text),
+        "city": extract_city(text),
+    }
+
+
 BLACKLIST_TOKENS = {
     'resume', 'cv', 'curriculum', 'vitae', 'portfolio', 'streamlit', 'github', 'linkedin', 'email', 'phone'
 }
@@ -120,17 +228,19 @@ TECH_TOKENS = {
     'mongodb','docker','kubernetes','tensorflow','pytorch','ml','ai','nlp','devops','engineer','developer',
     'data','science','datascientist','frontend','backend','fullstack','resume','cv'
 }
+# Single lookup set for "this token cannot be part of a name"
+_BAD_TOKENS = frozenset(BLACKLIST_TOKENS | TECH_TOKENS)
 
 
 def _looks_like_name(line: str) -> bool:
-    parts = [p for p in re.split(r"\s+", line.strip()) if p]
+    parts = [p for p in _SPLIT_WS.split(line.strip()) if p]
     if not (2 <= len(parts) <= 5):
         return False
-    if any(tok.lower() in BLACKLIST_TOKENS or tok.lower() in TECH_TOKENS for tok in parts):
+    if any(tok.lower() in _BAD_TOKENS for tok in parts):
         return False
     # Require at least one capitalized token
-    caps = sum(1 for p in parts if re.match(r"^[A-Z][a-zA-Z\-\.]+$", p))
-    return caps >= 1 and all(re.match(r"^[A-Za-z\-\.]+$", p) for p in parts)
+    caps = sum(1 for p in parts if _NAME_TOKEN_RE.match(p))
+    return caps >= 1 and all(_NAME_CHARS_RE.match(p) for p in parts)
 
 
 def extract_name(text: str) -> str:
@@ -143,180 +253,333 @@ def extract_name(text: str) -> str:
 
 
 def guess_name_from_text(text: str) -> str:
-    # Find adjacent capitalized tokens anywhere in first lines
-    lines = [ln.strip() for ln in (text or '').split('\n') if ln.strip()]
-    for line in lines[:30]:
-        tokens = [t for t in re.split(r"\s+", line) if t]
-        for i in range(len(tokens) - 1):
-            pair = f"{tokens[i]} {tokens[i+1]}"
-            if _looks_like_name(pair):
-                return pair
+    # Find adjacent capitalized tokens anywhere in first lines.
+    # Same acceptance as _looks_like_name(pair), but each token is classified once while
+    # sliding a two-token window instead of re-splitting and re-matching every pair.
+    lines = (ln for ln in (text or '').split('\n') if ln.strip())
+    for line in islice(lines, 30):
+        prev, prev_ok, prev_cap = "", False, False
+        for tok in _SPLIT_WS.split(line.strip()):
+            if not tok:
+                continue
+            ok = _NAME_CHARS_RE.match(tok) is not None and tok.lower() not in _BAD_TOKENS
+            cap = ok and _NAME_TOKEN_RE.match(tok) is not None
+            if ok and prev_ok and (cap or prev_cap):
+                return f"{prev} {tok}"
+            prev, prev_ok, prev_cap = tok, ok, cap
     return ""
 
 
 def _sanitize_name(raw: str) -> str:
     if not raw:
         return ""
-    tokens = [t for t in re.split(r"\s+", raw) if t]
+    # One C-level pass drops the unwanted ASCII characters; split() then yields only non-empty tokens
+    kept = raw.translate(_NAME_TRANS)
+    if not kept.isascii():
+        # Rare path: Unicode whitespace still separates tokens, other non-ASCII characters are dropped
+        kept = "".join([c if c.isascii() else " " if c.isspace() else "" for c in kept])
     clean = []
-    for t in tokens:
-        t2 = re.sub(r"[^A-Za-z\-]", "", t)
-        if not t2:
+    for t in kept.split():
+        if t.lower() in _BAD_TOKENS:
             continue
-        low = t2.lower()
-        if low in BLACKLIST_TOKENS or low in TECH_TOKENS:
-            continue
-        clean.append(t2.capitalize())
+        clean.append(t.capitalize())
     if len(clean) < 2:
         return ""
     return " ".join(clean[:4])
 
 
-def extract_linkedin(text: str) -> str:
-    """Extract LinkedIn profile, with or without protocol."""
-    patterns = [
-        r'https?://(?:www\.)?linkedin\.com/in/[A-Za-z0-9\-_/]+',
-        r'(?<!\w)(?:www\.)?linkedin\.com/in/[A-Za-z0-9\-_/]+',
-        r'(?<!\w)linkedin\.com/in/[A-Za-z0-9\-_/]+'
-    ]
-    for p in patterns:
-        m = re.search(p, text)
-        if m:
-            url = m.group(0)
-            if not url.startswith('http'):
-                url = 'https://' + url.lstrip()
-            return url
-    return ""
-
+COMMON_SKILLS = [
+    'Python', 'JavaScript', 'Java', 'C++', 'C#', 'React', 'Node.js', 'Angular', 'Vue.js',
+    'HTML', 'CSS', 'SQL', 'MongoDB', 'PostgreSQL', 'MySQL', 'AWS', 'Azure', 'Docker',
+    'Kubernetes', 'Git', 'Linux', 'Windows', 'Machine Learning', 'AI', 'Data Science',
+    'Project Management', 'Agile', 'Scrum', 'Leadership', 'Communication', 'Teamwork'
+]
 
-def extract_github(text: str) -> str:
-    """Extract GitHub URL with or without protocol."""
-    patterns = [
-        r'https?://(?:www\.)?github\.com/[A-Za-z0-9\-_/]+',
-        r'(?<!\w)(?:www\.)?github\.com/[A-Za-z0-9\-_/]+'
-    ]
-    for p in patterns:
-        m = re.search(p, text)
-        if m:
-            url = m.group(0)
-            if not url.startswith('http'):
-                url = 'https://' + url
-            return url
-    return ""
+# Aho-Corasick automaton over the lowercased vocabulary: one pass over the text finds every skill
+if AHOCORASICK_AVAILABLE:
+    _SKILL_AC = ahocorasick.Automaton()
+    for _skill in COMMON_SKILLS:
+        _SKILL_AC.add_word(_skill.lower(), _skill)
+    _SKILL_AC.make_automaton()
+else:
+    _SKILL_AC = None
 
 
 def extract_skills(text: str) -> List[str]:
-    """Extract skills from text (basic keyword matching)"""
-    common_skills = [
-        'Python', 'JavaScript', 'Java', 'C++', 'C#', 'React', 'Node.js', 'Angular', 'Vue.js',
-        'HTML', 'CSS', 'SQL', 'MongoDB', 'PostgreSQL', 'MySQL', 'AWS', 'Azure', 'Docker',
-        'Kubernetes', 'Git', 'Linux', 'Windows', 'Machine Learning', 'AI', 'Data Science',
-        'Project Management', 'Agile', 'Scrum', 'Leadership', 'Communication', 'Teamwork'
-    ]
-    
-    found_skills = []
+    """Extract skills from text (substring keyword matching), in COMMON_SKILLS order"""
     text_lower = text.lower()
-    for skill in common_skills:
-        if skill.lower() in text_lower:
-            found_skills.append(skill)
-    
-    return found_skills
+    if _SKILL_AC is not None:
+        found = {skill for _, skill in _SKILL_AC.iter(text_lower)}
+        return [skill for skill in COMMON_SKILLS if skill in found]
+    return [skill for skill in COMMON_SKILLS if skill.lower() in text_lower]
+
+
+def _wants_spacy(text: str) -> bool:
+    return SPACY_AVAILABLE and bool(text) and len(text) >= 10
 
 
 def extract_with_spacy(text: str) -> Dict[str, Any]:
-    """Use spaCy NER to improve name/email/org/location extraction."""
-    if not SPACY_AVAILABLE or not text or len(text) < 10:
+    """Use spaCy NER to improve name/org/location extraction."""
+    if not _wants_spacy(text):
         return {}
-    doc = _NLP(text)
+    return _entities_from_doc(_NLP(text[:SPACY_MAX_CHARS]))
+
+
+def extract_with_spacy_batch(texts: List[str]) -> List[Dict[str, Any]]:
+    """extract_with_spacy for many texts at once; nlp.pipe amortizes per-call setup across the batch."""
+    results: List[Dict[str, Any]] = [{} for _ in texts]
+    idx = [i for i, text in enumerate(texts) if _wants_spacy(text)]
+    if idx:
+        docs = _NLP.pipe((texts[i][:SPACY_MAX_CHARS] for i in idx), batch_size=SPACY_BATCH_SIZE)
+        for i, doc in zip(idx, docs):
+            results[i] = _entities_from_doc(doc)
+    return results
+
+
+def _entities_from_doc(doc) -> Dict[str, Any]:
     name = ""
-    email = extract_email(text)
-    phone = extract_phone(text)
     location = ""
     organizations: List[str] = []
-    persons: List[str] = []
+    seen_orgs = set()
 
     for ent in doc.ents:
-        if ent.label_ in ("PERSON",) and not persons:
-            persons.append(ent.text)
-        elif ent.label_ in ("GPE", "LOC") and not location:
+        label = ent.label_
+        if label == "PERSON" and not name:
+            name = ent.text
+        elif label in ("GPE", "LOC") and not location:
             location = ent.text
-        elif ent.label_ == "ORG":
+        elif label == "ORG" and len(organizations) < 5 and ent.text not in seen_orgs:
+            seen_orgs.add(ent.text)
             organizations.append(ent.text)
-
-    if persons:
-        name = persons[0]
+        if name and location and len(organizations) >= 5:
+            break
 
     return {
         "name": name,
-        "email": email,
-        "phone": phone,
         "location": location,
-        "organizations": list(dict.fromkeys(organizations))[:5],
+        "organizations": organizations,
+    }
+
+
+# Section header keywords as one automaton: a single pass over the line instead of one
+# substring scan per keyword
+if AHOCORASICK_AVAILABLE:
+    _SECTION_AC = ahocorasick.Automaton()
+    for _kw in _EXP_KEYWORDS:
+        _SECTION_AC.add_word(_kw, 'experience')
+    for _kw in _EDU_KEYWORDS:
+        _SECTION_AC.add_word(_kw, 'education')
+    _SECTION_AC.make_automaton()
+else:
+    _SECTION_AC = None
+
+
+def _section_type(line_lower: str) -> Optional[str]:
+    """'experience' or 'education' if the line contains a header keyword, else None.
+    Experience keywords win when a line has both."""
+    if _SECTION_AC is not None:
+        found = None
+        for _, kind in _SECTION_AC.iter(line_lower):
+            if kind == 'experience':
+                return kind
+            found = kind
+        return found
+    if any(k in line_lower for k in _EXP_KEYWORDS):
+        return 'experience'
+    if any(k in line_lower for k in _EDU_KEYWORDS):
+        return 'education'
+    return None
+
+
+def _flush_section(section: Dict[str, Any]) -> Dict[str, str]:
+    flushed = {
+        'type': section['type'],
+        'title': section['title'],
+        'content': "".join(section['lines'])[:SECTION_PREVIEW_CHARS + 1],
     }
+    if section['type'] == 'education':
+        degrees = section['degrees']
+        flushed['degree'] = next((w for w in DEGREE_KEYWORDS if w in degrees), "")
+        flushed['year'] = section['year']
+    return flushed
 
 
 def extract_experience_sections(text: str) -> List[Dict[str, str]]:
-    """Extract work experience sections from text"""
-    # Look for common section headers
-    experience_keywords = ['experience', 'employment', 'work history', 'professional experience']
-    education_keywords = ['education', 'academic', 'qualifications', 'degrees']
-    
+    """Extract work experience sections from text.
+    Only the first SECTION_PREVIEW_CHARS + 1 characters of each section's content are kept
+    (enough to tell whether it was cut). Education sections also carry the 'degree' keyword and
+    first 'year' found anywhere in the section, picked up line by line while scanning."""
     sections = []
-    lines = text.split('\n')
     current_section = None
     
-    for i, line in enumerate(lines):
-        line_lower = line.lower().strip()
-        
+    for line in text.split('\n'):
         # Check if this line is a section header
-        if any(keyword in line_lower for keyword in experience_keywords):
-            if current_section:
-                sections.append(current_section)
-            current_section = {
-                'type': 'experience',
-                'title': line.strip(),
-                'content': ''
-            }
-        elif any(keyword in line_lower for keyword in education_keywords):
+        line_lower = line.lower()
+        section_type = _section_type(line_lower)
+        if section_type:
             if current_section:
-                sections.append(current_section)
+                sections.append(_flush_section(current_section))
             current_section = {
-                'type': 'education',
+                'type': section_type,
                 'title': line.strip(),
-                'content': ''
+                'lines': [],
+                'size': 0,
+                'degrees': set(),
+                'year': "",
             }
         elif current_section:
-            current_section['content'] += line + '\n'
+            if current_section['size'] <= SECTION_PREVIEW_CHARS:
+                current_section['lines'].append(line + '\n')
+                current_section['size'] += len(line) + 1
+            if current_section['type'] == 'education':
+                current_section['degrees'].update(w for w in DEGREE_KEYWORDS if w in line_lower)
+                if not current_section['year']:
+                    year_match = _DATE_RE.search(line)
+                    if year_match:
+                        current_section['year'] = year_match.group(0)
     
     if current_section:
-        sections.append(current_section)
+        sections.append(_flush_section(current_section))
     
     return sections
 
 
+def _structure_sections(sections: List[Dict[str, str]]) -> tuple[List[Dict[str, str]], List[Dict[str, str]]]:
+    """Convert extracted sections into (workExperience, education) entries."""
+    work_experience: List[Dict[str, str]] = []
+    education: List[Dict[str, str]] = []
+    for section in sections:
+        content = section['content']
+        description = content[:SECTION_PREVIEW_CHARS] + '...' if len(content) > SECTION_PREVIEW_CHARS else content
+        if section['type'] == 'experience':
+            work_experience.append({
+                'title': section['title'],
+                'description': description,
+            })
+        elif section['type'] == 'education':
+            education.append({
+                'title': section['degree'].title() or section['title'],
+                'description': description,
+                'year': section['year'],
+            })
+    return work_experience, education
+
+
+def _resolve_name(name: str, email: str, raw_text: str, fname: str) -> str:
+    """Fallbacks for bad name extractions (missing, single word, common tool names):
+    email local part, then adjacent capitalized tokens in the header, then the file name.
+    Returns the sanitized name."""
+    lower_name = (name or '').lower().strip()
+    if not name or lower_name in BLACKLIST_TOKENS or len(name.split()) == 1:
+        # Try from email local part
+        if email and '@' in email:
+            local = email.split('@', 1)[0]
+            local = _sanitize_name(_NAME_SEPARATORS_RE.sub(' ', local))
+            if _looks_like_name(local):
+                name = local
+        # Try from text bigrams
+        if not name:
+            cand = _sanitize_name(guess_name_from_text(raw_text))
+            if cand and _looks_like_name(cand):
+                name = cand
+        # Try from filename
+        if not name and fname:
+            base = _FILE_EXT_RE.sub('', fname)
+            base = _sanitize_name(_NAME_SEPARATORS_RE.sub(' ', base))
+            if base and _looks_like_name(base):
+                name = base
+
+    # Final sanitize
+    return _sanitize_name(name)
+
+
 async def parse_resume_upload(file: UploadFile) -> Dict[str, Any]:
-    """Enhanced resume parser with better extraction capabilities"""
-    content = await file.read()
+    """Enhanced resume parser with better extraction capabilities.
+    PDF/DOCX/spaCy work is blocking, so it runs in a worker thread to keep the event loop free.
+    The upload is read from Starlette's spooled temp file instead of being copied into memory here."""
     filename = file.filename or ""
-    
-    # Extract text based on file type
+    await file.seek(0)
+    return await asyncio.to_thread(_parse_upload_file, file.file, filename)
+
+
+async def parse_resume_uploads(files: List[UploadFile]) -> List[Dict[str, Any]]:
+    """Batch variant of parse_resume_upload. Text extraction runs concurrently in worker threads,
+    then spaCy processes all texts in one nlp.pipe call. Results keep the order of `files`."""
+    filenames = [f.filename or "" for f in files]
+    for f in files:
+        await f.seek(0)
+    extracted = await asyncio.gather(*(
+        asyncio.to_thread(_extract_upload_file, f.file, name) for f, name in zip(files, filenames)
+    ))
+    return await asyncio.to_thread(_parse_upload_batch, list(extracted), filenames)
+
+
+def _parse_upload_batch(extracted: List[tuple[str, str]], filenames: List[str]) -> List[Dict[str, Any]]:
+    """Unsupported files get an {"filename", "error"} entry instead of failing the whole batch."""
+    supported = [name.lower().endswith(UPLOAD_EXTENSIONS) for name in filenames]
+    contacts = [extract_contacts(raw_text) if ok else {} for (raw_text, _), ok in zip(extracted, supported)]
+    # Empty strings are skipped by the batch, so resumes that don't need NER cost nothing
+    ners = extract_with_spacy_batch([
+        raw_text[:SPACY_FALLBACK_CHARS] if ok and _needs_ner(font_name, c) else ""
+        for (raw_text, font_name), c, ok in zip(extracted, contacts, supported)
+    ])
+    return [
+        {"filename": filename, **_parse_upload_text(raw_text, font_name, filename, ner, c)} if ok
+        else {"filename": filename, "error": raw_text}
+        for (raw_text, font_name), filename, ner, c, ok in zip(extracted, filenames, ners, contacts, supported)
+    ]
+
+
+def _extract_pdf_upload(fileobj: IO[bytes]) -> tuple[str, str]:
+    size = fileobj.seek(0, os.SEEK_END)
+    fileobj.seek(0)
+    if size <= UPLOAD_IN_MEMORY_MAX_BYTES:
+        return extract_text_and_name_from_pdf(fileobj.read())
+    fd, tmp_path = tempfile.mkstemp(suffix=".pdf")
+    try:
+        with os.fdopen(fd, "wb") as tmp:
+            shutil.copyfileobj(fileobj, tmp, UPLOAD_CHUNK_BYTES)
+        return _parse_pdf_path(tmp_path)
+    finally:
+        os.unlink(tmp_path)
+
+
+def _extract_upload_file(fileobj: IO[bytes], filename: str) -> tuple[str, str]:
+    """Return (raw text, font-based name) for an uploaded file based on its extension."""
+    # For PDFs the font-based name comes from the same pass as the text
     if filename.lower().endswith('.pdf'):
-        raw_text = extract_text_from_pdf(content)
-    elif filename.lower().endswith(('.doc', '.docx')):
-        raw_text = extract_text_from_docx(content)
-    else:
-        raw_text = f"Unsupported file type: {filename}"
-    
-    # Extract structured information
-    ner = extract_with_spacy(raw_text)
-    # Try font-based detection first for PDFs
-    font_name = extract_name_by_font_from_pdf(content) if filename.lower().endswith('.pdf') else ""
+        return _extract_pdf_upload(fileobj)
+    if filename.lower().endswith(('.doc', '.docx')):
+        return extract_text_from_docx(fileobj), ""
+    return f"Unsupported file type: {filename}", ""
+
+
+def _parse_upload_file(fileobj: IO[bytes], filename: str) -> Dict[str, Any]:
+    """Synchronous body of parse_resume_upload."""
+    raw_text, font_name = _extract_upload_file(fileobj, filename)
+    return _parse_upload_text(raw_text, font_name, filename)
+
+
+def _needs_ner(font_name: str, contacts: Dict[str, str]) -> bool:
+    """spaCy is only a fallback: skip it when the cheap extractors already found name, email and phone."""
+    return not (font_name and contacts["email"] and contacts["phone"])
+
+
+def _parse_upload_text(raw_text: str, font_name: str, filename: str,
+                       ner: Optional[Dict[str, Any]] = None,
+                       contacts: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """Build the parsed payload from extracted text; `ner`/`contacts` may be precomputed by the batch path."""
+    # Cheap extractors first, spaCy only for what they missed
+    if contacts is None:
+        contacts = extract_contacts(raw_text)
+    if ner is None:
+        ner = extract_with_spacy(raw_text[:SPACY_FALLBACK_CHARS]) if _needs_ner(font_name, contacts) else {}
     name = font_name or ner.get("name") or extract_name(raw_text)
-    email = ner.get("email") or extract_email(raw_text)
-    phone = ner.get("phone") or extract_phone(raw_text)
-    location = ner.get("location", "")
-    linkedin = extract_linkedin(raw_text)
-    github = extract_github(raw_text)
+    email = contacts["email"]
+    phone = contacts["phone"]
+    location = ner.get("location", "") or contacts["city"]
+    linkedin = contacts["linkedin"]
+    github = contacts["github"]
     skills = extract_skills(raw_text)
     sections = extract_experience_sections(raw_text)
     
@@ -332,52 +595,10 @@ async def parse_resume_upload(file: UploadFile) -> Dict[str, Any]:
         if name in line:
             name_found = True
     
-    # Additional fallback for bad extractions like common tool names
-    lower_name = (name or '').lower().strip()
-    if not name or lower_name in BLACKLIST_TOKENS or len(name.split()) == 1:
-        # Try from email local part
-        if email and '@' in email:
-            local = email.split('@', 1)[0]
-            local = re.sub(r'[._-]+', ' ', local)
-            local = _sanitize_name(local)
-            if _looks_like_name(local):
-                name = local
-        # Try from text bigrams
-        if not name:
-            cand = guess_name_from_text(raw_text)
-            cand = _sanitize_name(cand)
-            if cand and _looks_like_name(cand):
-                name = cand
-        # Try from filename
-        if not name and filename:
-            base = re.sub(r'\.[A-Za-z0-9]+$', '', filename)
-            base = re.sub(r'[._-]+', ' ', base)
-            base = _sanitize_name(base)
-            if base and _looks_like_name(base):
-                name = base
-
-    # Final sanitize
-    name = _sanitize_name(name)
+    name = _resolve_name(name, email, raw_text, filename)
 
     # Convert sections to structured format
-    work_experience = []
-    education = []
-    
-    for section in sections:
-        if section['type'] == 'experience':
-            work_experience.append({
-                'title': section['title'],
-                'description': section['content'][:200] + '...' if len(section['content']) > 200 else section['content']
-            })
-        elif section['type'] == 'education':
-            # Try to extract degree and year
-            degree = next((w for w in DEGREE_KEYWORDS if w in section['content'].lower()), "")
-            year_match = re.search(DATE_PATTERN, section['content'], flags=re.IGNORECASE)
-            education.append({
-                'title': degree.title() or section['title'],
-                'description': section['content'][:200] + '...' if len(section['content']) > 200 else section['content'],
-                'year': year_match.group(0) if year_match else "",
-            })
+    work_experience, education = _structure_sections(sections)
     
     return {
         "parsed": {
@@ -405,37 +626,30 @@ async def parse_resume_upload(file: UploadFile) -> Dict[str, Any]:
 
 def parse_resume_from_path(file_path: str) -> Dict[str, Any]:
     """Synchronous helper to parse a local file path on the server.
-    Mirrors parse_resume_upload but reads bytes from disk."""
+    Mirrors parse_resume_upload but lets PyMuPDF/python-docx open the file directly."""
     if not os.path.isfile(file_path):
         return {"error": f"file not found: {file_path}"}
-    try:
-        with open(file_path, "rb") as f:
-            content = f.read()
-    except Exception as e:
-        return {"error": f"failed to read file: {e}"}
+    if not os.access(file_path, os.R_OK):
+        return {"error": f"failed to read file: permission denied: {file_path}"}
 
     lower = file_path.lower()
     if lower.endswith('.pdf'):
-        raw_text = extract_text_from_pdf(content)
-        font_name = extract_name_by_font_from_pdf(content)
+        raw_text, font_name = _parse_pdf_path(file_path)
     elif lower.endswith(('.doc', '.docx')):
-        raw_text = extract_text_from_docx(content)
+        raw_text = extract_text_from_docx(file_path)
         font_name = ""
     else:
         return {"error": f"unsupported file type: {file_path}"}
 
     ner = extract_with_spacy(raw_text)
+    contacts = extract_contacts(raw_text)
     name = font_name or ner.get("name") or extract_name(raw_text)
-    email = ner.get("email") or extract_email(raw_text)
-    phone = ner.get("phone") or extract_phone(raw_text)
-    location = ner.get("location", "")
-    if not location:
-        # simple fallback for common city,country patterns found in resumes
-        city_candidates = re.findall(r"\b([A-Z][a-zA-Z]+,\s*[A-Z][a-zA-Z]+)\b", raw_text)
-        if city_candidates:
-            location = city_candidates[0]
-    linkedin = extract_linkedin(raw_text)
-    github = extract_github(raw_text)
+    email = contacts["email"]
+    phone = contacts["phone"]
+    # simple fallback for common city,country patterns found in resumes
+    location = ner.get("location", "") or contacts["city"]
+    linkedin = contacts["linkedin"]
+    github = contacts["github"]
     skills = extract_skills(raw_text)
     sections = extract_experience_sections(raw_text)
 
@@ -444,49 +658,15 @@ def parse_resume_from_path(file_path: str) -> Dict[str, Any]:
     lines_iter = [ln.strip() for ln in raw_text.split('\n') if ln.strip()]
     # pick first non-contact, non-link line after header block
     for ln in lines_iter[:80]:
-        if re.search(r"@|linkedin|github|phone|\+\d|mailto|http", ln, flags=re.I):
+        if _CONTACT_LINE_RE.search(ln):
             continue
         if len(ln) > 20:
             summary = ln
             break
 
-    # sanitize name fallbacks
-    lower_name = (name or '').lower().strip()
-    if not name or lower_name in BLACKLIST_TOKENS or len(name.split()) == 1:
-        if email and '@' in email:
-            local = email.split('@', 1)[0]
-            local = re.sub(r'[._-]+', ' ', local)
-            local = _sanitize_name(local)
-            if _looks_like_name(local):
-                name = local
-        if not name:
-            cand = _sanitize_name(guess_name_from_text(raw_text))
-            if cand and _looks_like_name(cand):
-                name = cand
-        if not name:
-            base = re.sub(r'\.[A-Za-z0-9]+$', '', os.path.basename(file_path))
-            base = _sanitize_name(re.sub(r'[._-]+', ' ', base))
-            if base and _looks_like_name(base):
-                name = base
-
-    name = _sanitize_name(name)
+    name = _resolve_name(name, email, raw_text, os.path.basename(file_path))
 
-    work_experience: List[Dict[str,str]] = []
-    education: List[Dict[str,str]] = []
-    for section in sections:
-        if section['type'] == 'experience':
-            work_experience.append({
-                'title': section['title'],
-                'description': section['content'][:200] + '...' if len(section['content']) > 200 else section['content']
-            })
-        elif section['type'] == 'education':
-            degree = next((w for w in DEGREE_KEYWORDS if w in section['content'].lower()), "")
-            year_match = re.search(DATE_PATTERN, section['content'], flags=re.IGNORECASE)
-            education.append({
-                'title': degree.title() or section['title'],
-                'description': section['content'][:200] + '...' if len(section['content']) > 200 else section['content'],
-                'year': year_match.group(0) if year_match else "",
-            })
+    work_experience, education = _structure_sections(sections)
 
     return {
         "parsed": {
@@ -1,37 +1,82 @@
-from typing import Dict, List
+from typing import Callable, Dict, List, Tuple
 from io import BytesIO
+from operator import itemgetter
+import functools
 import os
+import re
+import shutil
+import string
 import subprocess
 import tempfile
-from fastapi.responses import HTMLResponse, StreamingResponse
+from fastapi.responses import FileResponse, HTMLResponse, StreamingResponse
+
+
+# Placeholders understood by the LaTeX templates, written as $key$ in the .tex source
+_PLACEHOLDER_KEYS = (
+    "name", "email", "phone", "location", "linkedin", "github", "website", "summary",
+    "work_experience", "education", "skills", "projects", "certifications",
+)
+_PLACEHOLDER_RE = re.compile(r"\$(" + "|".join(map(re.escape, _PLACEHOLDER_KEYS)) + r")\$")
+
+_URL_SCHEMES = ("http://", "https://")
+
+# LaTeX special characters in user-supplied text; unescaped they break the pdflatex build
+_LATEX_ESCAPE_TABLE = str.maketrans({
+    "&": r"\&",
+    "%": r"\%",
+    "$": r"\$",
+    "#": r"\#",
+    "_": r"\_",
+    "{": r"\{",
+    "}": r"\}",
+    "~": r"\textasciitilde{}",
+    "^": r"\textasciicircum{}",
+    "\\": r"\textbackslash{}",
+})
+
+
+def _latex_escape(text: str | None) -> str:
+    return (text or "").translate(_LATEX_ESCAPE_TABLE)
+
+
+# User URLs inside \href{...}: # and % need a backslash there, while braces and backslashes are
+# still parsed as TeX, so those are percent-encoded (as is whitespace, which would end the argument)
+_LATEX_URL_ESCAPE_TABLE = str.maketrans({
+    "\\": "%5C",
+    "{": "%7B",
+    "}": "%7D",
+    "#": r"\#",
+    "%": r"\%",
+    " ": "%20",
+    "\t": "%09",
+    "\r": "%0D",
+    "\n": "%0A",
+})
+
+
+def _latex_href(url: str, label: str) -> str:
+    """\\href with the user-supplied URL made safe for the TeX argument."""
+    return f"\\href{{{url.translate(_LATEX_URL_ESCAPE_TABLE)}}}{{{label}}}"
 
 
 def format_work_experience(work_experience: List[Dict]) -> str:
     """Format work experience for LaTeX"""
     if not work_experience:
         return ""
-    
-    latex = "\\section{Work Experience}\n"
-    for exp in work_experience:
-        title = exp.get('title', 'Position')
-        description = exp.get('description', '')
-        latex += f"\\textbf{{{title}}}\\\\\n"
-        latex += f"{description}\n\n"
-    return latex
+    return "\\section{Work Experience}\n" + "".join([
+        f"\\textbf{{{_latex_escape(exp.get('title') or 'Position')}}}\\\\\n{_latex_escape(exp.get('description'))}\n\n"
+        for exp in work_experience
+    ])
 
 
 def format_education(education: List[Dict]) -> str:
     """Format education for LaTeX"""
     if not education:
         return ""
-    
-    latex = "\\section{Education}\n"
-    for edu in education:
-        title = edu.get('title', 'Degree')
-        description = edu.get('description', '')
-        latex += f"\\textbf{{{title}}}\\\\\n"
-        latex += f"{description}\n\n"
-    return latex
+    return "\\section{Education}\n" + "".join([
+        f"\\textbf{{{_latex_escape(edu.get('title') or 'Degree')}}}\\\\\n{_latex_escape(edu.get('description'))}\n\n"
+        for edu in education
+    ])
 
 
 def format_skills(skills: List[Dict]) -> str:
@@ -39,27 +84,20 @@ def format_skills(skills: List[Dict]) -> str:
     if not skills:
         return ""
     
-    skill_names = [skill.get('name', '') for skill in skills if skill.get('name')]
+    skill_names = [_latex_escape(name) for name in (skill.get('name') for skill in skills) if name]
     if not skill_names:
         return ""
-    
-    latex = "\\section{Skills}\n"
-    latex += ", ".join(skill_names)
-    return latex
+    return "\\section{Skills}\n" + ", ".join(skill_names)
 
 
 def format_projects(projects: List[Dict]) -> str:
     """Format projects for LaTeX"""
     if not projects:
         return ""
-    
-    latex = "\\section{Projects}\n"
-    for project in projects:
-        name = project.get('name', 'Project')
-        description = project.get('description', '')
-        latex += f"\\textbf{{{name}}}\\\\\n"
-        latex += f"{description}\n\n"
-    return latex
+    return "\\section{Projects}\n" + "".join([
+        f"\\textbf{{{_latex_escape(project.get('name') or 'Project')}}}\\\\\n{_latex_escape(project.get('description'))}\n\n"
+        for project in projects
+    ])
 
 
 def format_certifications(certifications: List[Dict]) -> str:
@@ -67,49 +105,68 @@ def format_certifications(certifications: List[Dict]) -> str:
     if not certifications:
         return ""
     
-    latex = "\\section{Certifications}\n"
+    lines = ["\\section{Certifications}\n"]
+    append = lines.append
     for cert in certifications:
-        name = cert.get('name', 'Certification')
-        issuer = cert.get('issuer', '')
-        date = cert.get('date', '')
-        latex += f"\\textbf{{{name}}}"
+        # Missing optional fields come back as None and are simply skipped
+        issuer = cert.get('issuer')
+        date = cert.get('date')
+        append(f"\\textbf{{{_latex_escape(cert.get('name') or 'Certification')}}}")
         if issuer:
-            latex += f" - {issuer}"
+            append(f" - {_latex_escape(issuer)}")
         if date:
-            latex += f" ({date})"
-        latex += "\\\\\n"
-    return latex
+            append(f" ({_latex_escape(date)})")
+        append("\\\\\n")
+    return "".join(lines)
 
 
 def format_linkedin_url(linkedin: str) -> str:
     """Format LinkedIn URL for LaTeX"""
     if not linkedin:
         return ""
-    if linkedin.startswith('http'):
-        return f"\\href{{{linkedin}}}{{LinkedIn}}"
-    return f"\\href{{https://linkedin.com/in/{linkedin}}}{{LinkedIn}}"
+    if linkedin.startswith(_URL_SCHEMES):
+        return _latex_href(linkedin, "LinkedIn")
+    return _latex_href(f"https://linkedin.com/in/{linkedin}", "LinkedIn")
 
 
 def format_github_url(github: str) -> str:
     """Format GitHub URL for LaTeX"""
     if not github:
         return ""
-    if github.startswith('http'):
-        return f"\\href{{{github}}}{{GitHub}}"
-    return f"\\href{{https://github.com/{github}}}{{GitHub}}"
+    if github.startswith(_URL_SCHEMES):
+        return _latex_href(github, "GitHub")
+    return _latex_href(f"https://github.com/{github}", "GitHub")
 
 
 def format_website_url(website: str) -> str:
     """Format website URL for LaTeX"""
     if not website:
         return ""
-    if not website.startswith('http'):
+    if not website.startswith(_URL_SCHEMES):
         website = f"https://{website}"
-    return f"\\href{{{website}}}{{Website}}"
+    return _latex_href(website, "Website")
+
 
+def _tuple_getter(keys: Tuple[str, ...]) -> Callable[[Dict], tuple]:
+    """itemgetter that always returns a tuple, whatever the number of keys."""
+    if len(keys) == 1:
+        key = keys[0]
+        return lambda d: (d[key],)
+    return itemgetter(*keys) if keys else (lambda d: ())
 
-def substitute_template_variables(template_content: str, data: Dict) -> str:
-    """Substitute variables in LaTeX template"""
+
+@functools.lru_cache(maxsize=16)
+def _load_template(path: str, mtime_ns: int) -> Tuple[Tuple[str, ...], Callable[[Dict], tuple]]:
+    """Read a LaTeX template and split it once on its placeholders. `mtime_ns` is part of the cache key.
+    Returns the split parts (literal, key, literal, ..., literal) and a getter for the keys' values."""
+    # Raw bytes are decoded once here; cache hits skip both the read and the UTF-8 decode
+    with open(path, 'rb') as f:
+        parts = tuple(_PLACEHOLDER_RE.split(f.read().decode('utf-8')))
+    return parts, _tuple_getter(parts[1::2])
+
+
+def substitute_template_variables(template: Tuple[Tuple[str, ...], Callable[[Dict], tuple]], data: Dict) -> str:
+    """Substitute variables in a LaTeX template pre-split by _load_template"""
     p = data.get("personalInfo", {})
     
     # Format URLs
@@ -117,16 +174,16 @@ def substitute_template_variables(template_content: str, data: Dict) -> str:
     github_url = format_github_url(p.get("github", ""))
     website_url = format_website_url(p.get("website", ""))
     
-    # Basic substitutions
+    # Basic substitutions; user text is escaped, the \href URLs above have their own escaping
     substitutions = {
-        '$name$': p.get("name", "Your Name"),
-        '$email$': p.get("email", "your.email@example.com"),
-        '$phone$': p.get("phone", "(123) 456-7890"),
-        '$location$': p.get("location", "City, State"),
-        '$linkedin$': linkedin_url,
-        '$github$': github_url,
-        '$website$': website_url,
-        '$summary$': data.get("summary", "Professional summary goes here."),
+        'name': _latex_escape(p.get("name", "Your Name")),
+        'email': _latex_escape(p.get("email", "your.email@example.com")),
+        'phone': _latex_escape(p.get("phone", "(123) 456-7890")),
+        'location': _latex_escape(p.get("location", "City, State")),
+        'linkedin': linkedin_url,
+        'github': github_url,
+        'website': website_url,
+        'summary': _latex_escape(data.get("summary", "Professional summary goes here.")),
     }
     
     # Format individual sections
@@ -138,97 +195,56 @@ def substitute_template_variables(template_content: str, data: Dict) -> str:
     
     # Add section substitutions
     substitutions.update({
-        '$work_experience$': work_exp,
-        '$education$': education,
-        '$skills$': skills,
-        '$projects$': projects,
-        '$certifications$': certifications,
+        'work_experience': work_exp,
+        'education': education,
+        'skills': skills,
+        'projects': projects,
+        'certifications': certifications,
     })
     
-    # Apply substitutions
-    result = template_content
-    for placeholder, value in substitutions.items():
-        result = result.replace(placeholder, value)
-    
-    return result
+    # Overwrite the placeholder slots with their values and join; every step is a C-level call
+    parts, values_of = template
+    out = list(parts)
+    out[1::2] = values_of(substitutions)
+    return "".join(out)
 
 
 def _html_escape(text: str) -> str:
+    # Kept as a replace chain on purpose: each replace is a fast C scan that returns the input
+    # untouched when there is nothing to escape, while str.translate with multi-character
+    # replacements takes CPython's slow per-character path (~3-7x slower on resume-sized fields).
     return (text or "").replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
 
 
 def _html_sections_from_data(data: Dict) -> Dict[str, str]:
-    work = []
-    for exp in data.get("workExperience", []) or []:
-        title = _html_escape(exp.get("title") or exp.get("company") or "Experience")
-        desc = _html_escape(exp.get("description", ""))
-        work.append(f"<div class=\"item\"><div class=\"ititle\"><strong>{title}</strong></div><div class=\"ibody\">{desc}</div></div>")
-    education = []
-    for edu in data.get("education", []) or []:
-        title = _html_escape(edu.get("title") or edu.get("degree") or "Education")
-        desc = _html_escape(edu.get("description", ""))
-        education.append(f"<div class=\"item\"><div class=\"ititle\"><strong>{title}</strong></div><div class=\"ibody\">{desc}</div></div>")
-    skills = []
-    for sk in data.get("skills", []) or []:
-        name = _html_escape(sk.get("name") if isinstance(sk, dict) else str(sk))
-        if name:
-            skills.append(f"<span class=\"skill\">{name}</span>")
-    projects = []
-    for pr in data.get("projects", []) or []:
-        name = _html_escape(pr.get("name", "Project"))
-        desc = _html_escape(pr.get("description", ""))
-        projects.append(f"<div class=\"item\"><div class=\"ititle\"><strong>{name}</strong></div><div class=\"ibody\">{desc}</div></div>")
-    certs = []
-    for c in data.get("certifications", []) or []:
-        nm = _html_escape(c.get("name", "Certification"))
-        issuer = _html_escape(c.get("issuer", ""))
-        certs.append(f"<div class=\"item\"><div class=\"ititle\"><strong>{nm}</strong></div><div class=\"ibody\">{issuer}</div></div>")
+    # list comprehension + join measured faster than io.StringIO writes at every size (0-200 items)
     return {
-        "work": "\n".join(work),
-        "education": "\n".join(education),
-        "skills": "\n".join(skills),
-        "projects": "\n".join(projects),
-        "certs": "\n".join(certs),
+        "work": "\n".join([
+            f"<div class=\"item\"><div class=\"ititle\"><strong>{_html_escape(exp.get('title') or exp.get('company') or 'Experience')}</strong></div><div class=\"ibody\">{_html_escape(exp.get('description', ''))}</div></div>"
+            for exp in data.get("workExperience") or ()
+        ]),
+        "education": "\n".join([
+            f"<div class=\"item\"><div class=\"ititle\"><strong>{_html_escape(edu.get('title') or edu.get('degree') or 'Education')}</strong></div><div class=\"ibody\">{_html_escape(edu.get('description', ''))}</div></div>"
+            for edu in data.get("education") or ()
+        ]),
+        "skills": "\n".join([
+            f"<span class=\"skill\">{name}</span>"
+            for name in (_html_escape(sk.get("name") if isinstance(sk, dict) else str(sk)) for sk in data.get("skills") or ())
+            if name
+        ]),
+        "projects": "\n".join([
+            f"<div class=\"item\"><div class=\"ititle\"><strong>{_html_escape(pr.get('name', 'Project'))}</strong></div><div class=\"ibody\">{_html_escape(pr.get('description', ''))}</div></div>"
+            for pr in data.get("projects") or ()
+        ]),
+        "certs": "\n".join([
+            f"<div class=\"item\"><div class=\"ititle\"><strong>{_html_escape(c.get('name', 'Certification'))}</strong></div><div class=\"ibody\">{_html_escape(c.get('issuer', ''))}</div></div>"
+            for c in data.get("certifications") or ()
+        ]),
     }
 
 
-def render_html_from_data(data: Dict, template: str | None = None) -> HTMLResponse:
-    """Render HTML preview with themes approximating the LaTeX templates."""
-    p = data.get("personalInfo", {})
-    name = _html_escape(p.get("name", "Your Name"))
-    email = _html_escape(p.get("email", "your.email@example.com"))
-    phone = _html_escape(p.get("phone", "(123) 456-7890"))
-    location = _html_escape(p.get("location", "City, State"))
-    ln_raw = (p.get("linkedin", "") or "").strip()
-    gh_raw = (p.get("github", "") or "").strip()
-    ws_raw = (p.get("website", "") or "").strip()
-    def _ensure_http(u: str) -> str:
-        if not u:
-            return ""
-        if not u.startswith("http"):
-            return ("https://" + u).replace("https://https://", "https://")
-        return u
-    ln = _html_escape(_ensure_http(ln_raw if ln_raw else ""))
-    if ln and "linkedin.com" not in ln:
-        # allow plain handle like aaryan-gole
-        ln = f"https://linkedin.com/in/{_html_escape(ln_raw)}"
-    gh = _html_escape(_ensure_http(gh_raw if gh_raw else ""))
-    if gh and "github.com" not in gh:
-        gh = f"https://github.com/{_html_escape(gh_raw)}"
-    ws = _html_escape(_ensure_http(ws_raw))
-    ln_html = f'<a href="{ln}" target="_blank" rel="noopener">{ln}</a>' if ln else ""
-    gh_html = f'<a href="{gh}" target="_blank" rel="noopener">{gh}</a>' if gh else ""
-    ws_html = f'<a href="{ws}" target="_blank" rel="noopener">{ws}</a>' if ws else ""
-    summary = _html_escape(data.get("summary", "Professional summary goes here."))
-
-    tname = (template or "billryan_basic").lower()
-    sections = _html_sections_from_data(data)
-
-    # Strongly differentiated Modern Executive: two-column with left sidebar
-    if "modern_executive" in tname:
-        primary = "#1f2937"  # slate-800
-        accent = "#4f46e5"   # indigo-600
-        html = f"""
+# Strongly differentiated Modern Executive: two-column with left sidebar
+_TMPL_MODERN_EXEC = """
 <!doctype html>
 <html>
   <head>
@@ -236,7 +252,7 @@ def render_html_from_data(data: Dict, template: str | None = None) -> HTMLRespon
     <title>Resume - {name}</title>
     <style>
       :root {{ --primary: {primary}; --accent: {accent}; }}
-      * {{ box-sizing: border-box; }}
+      {base_css}
       body {{ margin: 0; font-family: 'Inter','Segoe UI',Tahoma,sans-serif; color: #111827; }}
       .container {{ display: grid; grid-template-columns: 280px 1fr; min-height: 100vh; }}
       .sidebar {{ background: #111827; color: #e5e7eb; padding: 28px 24px; }}
@@ -252,7 +268,6 @@ def render_html_from_data(data: Dict, template: str | None = None) -> HTMLRespon
       .hdr h1 {{ margin:0; font-size: 34px; font-weight: 900; color: var(--primary); }}
       .hdr .meta {{ color:#4b5563; margin-top: 6px; }}
       h2 {{ margin: 20px 0 8px; font-size: 14px; letter-spacing:.14em; text-transform: uppercase; color: var(--primary); }}
-      .item {{ margin:10px 0; }}
       .summary {{ background: #f8fafc; border:1px solid #e5e7eb; padding:14px 16px; border-radius: 8px; }}
       .section-divider {{ height: 1px; background: #e5e7eb; margin: 8px 0 4px; }}
       @media print {{
@@ -273,75 +288,66 @@ def render_html_from_data(data: Dict, template: str | None = None) -> HTMLRespon
             <li>{email}</li>
             <li>{phone}</li>
             <li>{location}</li>
-            {f"<li>{ln_html}</li>" if ln_html else ''}
-            {f"<li>{gh_html}</li>" if gh_html else ''}
-            {f"<li>{ws_html}</li>" if ws_html else ''}
+            {ln_block}
+            {gh_block}
+            {ws_block}
           </ul>
         </div>
-        {f"<div class='side-block'><div class='sb-title'>Skills</div><div>{sections['skills']}</div></div>" if sections['skills'] else ''}
-        {f"<div class='side-block'><div class='sb-title'>Certifications</div><div>{sections['certs']}</div></div>" if sections['certs'] else ''}
+        {skills_block}
+        {certs_block}
       </aside>
       <main class='content'>
         <div class='hdr'>
           <h1>{name}</h1>
-          <div class='meta'>{email} · {phone} · {location}{' · ' + ln_html if ln_html else ''}{' · ' + gh_html if gh_html else ''}{' · ' + ws_html if ws_html else ''}</div>
+          <div class='meta'>{contact_line}</div>
         </div>
         <section>
           <h2>Professional Summary</h2>
           <div class='summary'>{summary}</div>
         </section>
         <div class='section-divider'></div>
-        {f"<section><h2>Work Experience</h2><div>{sections['work']}</div></section>" if sections['work'] else ''}
-        {f"<section><h2>Projects</h2><div>{sections['projects']}</div></section>" if sections['projects'] else ''}
-        {f"<section><h2>Education</h2><div>{sections['education']}</div></section>" if sections['education'] else ''}
+        {work_block}
+        {projects_block}
+        {education_block}
       </main>
     </div>
   </body>
 </html>
 """
-        return HTMLResponse(content=html)
 
-    if "billryan_modern" in tname:
-        primary = "#2c3e50"
-        html = f"""
+_TMPL_BILLRYAN_MODERN = """
 <!doctype html>
 <html>
   <head>
     <meta charset='utf-8'/>
     <title>Resume - {name}</title>
     <style>
-      body {{ font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; margin: 40px auto; max-width: 820px; color:#333; line-height:1.6; }}
+      {base_css}
       .head {{ text-align:center; margin-bottom:24px; padding-bottom:16px; border-bottom:2px solid {primary}; }}
       .head h1 {{ margin:0; font-size:40px; font-weight:700; color:{primary}; }}
       .contact {{ color:#555; margin-top:6px; }}
       h2 {{ color:{primary}; margin:28px 0 10px; padding-bottom:6px; border-bottom:1px solid #d0d7de; font-size:16px; letter-spacing:.06em; text-transform:uppercase; }}
       .summary {{ background:#f5f7fb; border:1px solid #e1e6f0; padding:14px 16px; border-radius:10px; }}
-      .skills {{ display:flex; flex-wrap:wrap; gap:8px; }}
       .skill {{ background:#ecf0f1; padding:4px 10px; border-radius:14px; font-size:12px; }}
-      .item {{ margin:10px 0; }}
-      .ititle {{ margin-bottom:4px; }}
     </style>
   </head>
   <body>
     <div class='head'>
       <h1>{name}</h1>
-      <div class='contact'>{email} · {phone} · {location}{' · ' + ln_html if ln_html else ''}{' · ' + gh_html if gh_html else ''}{' · ' + ws_html if ws_html else ''}</div>
+      <div class='contact'>{contact_line}</div>
     </div>
     <h2>Professional Summary</h2>
     <div class='summary'>{summary}</div>
-    {f"<h2>Work Experience</h2><div>{sections['work']}</div>" if sections['work'] else ''}
-    {f"<h2>Education</h2><div>{sections['education']}</div>" if sections['education'] else ''}
-    {f"<h2>Skills</h2><div class='skills'>{sections['skills']}</div>" if sections['skills'] else ''}
-    {f"<h2>Projects</h2><div>{sections['projects']}</div>" if sections['projects'] else ''}
-    {f"<h2>Certifications</h2><div>{sections['certs']}</div>" if sections['certs'] else ''}
+    {work_block}
+    {education_block}
+    {skills_block}
+    {projects_block}
+    {certs_block}
   </body>
 </html>
 """
-        return HTMLResponse(content=html)
 
-    if "classic_professional" in tname:
-        primary = "#0f172a"
-        html = f"""
+_TMPL_CLASSIC = """
 <!doctype html>
 <html>
   <head>
@@ -360,23 +366,21 @@ def render_html_from_data(data: Dict, template: str | None = None) -> HTMLRespon
   <body>
     <div class='head'>
       <h1>{name}</h1>
-      <div class='muted'>{email} · {phone} · {location}{' · ' + ln_html if ln_html else ''}{' · ' + gh_html if gh_html else ''}{' · ' + ws_html if ws_html else ''}</div>
+      <div class='muted'>{contact_line}</div>
       <hr />
     </div>
     <h2>Professional Summary</h2>
     <div>{summary}</div>
-    {f"<h2>Work Experience</h2><div>{sections['work']}</div>" if sections['work'] else ''}
-    {f"<h2>Education</h2><div>{sections['education']}</div>" if sections['education'] else ''}
-    {f"<h2>Skills</h2><div>{sections['skills']}</div>" if sections['skills'] else ''}
-    {f"<h2>Projects</h2><div>{sections['projects']}</div>" if sections['projects'] else ''}
-    {f"<h2>Certifications</h2><div>{sections['certs']}</div>" if sections['certs'] else ''}
+    {work_block}
+    {education_block}
+    {skills_block}
+    {projects_block}
+    {certs_block}
   </body>
 </html>
 """
-        return HTMLResponse(content=html)
 
-    if "minimal_clean" in tname:
-        html = f"""
+_TMPL_MINIMAL = """
 <!doctype html>
 <html>
   <head>
@@ -395,36 +399,30 @@ def render_html_from_data(data: Dict, template: str | None = None) -> HTMLRespon
   <body>
     <div class='head'>
       <h1>{name}</h1>
-      <div class='muted'>{email} · {phone} · {location}{' · ' + ln_html if ln_html else ''}{' · ' + gh_html if gh_html else ''}{' · ' + ws_html if ws_html else ''}</div>
+      <div class='muted'>{contact_line}</div>
     </div>
     <section>
       <h2>Professional Summary</h2>
       <div>{summary}</div>
     </section>
-    {f"<section><h2>Work Experience</h2><div>{sections['work']}</div></section>" if sections['work'] else ''}
-    {f"<section><h2>Education</h2><div>{sections['education']}</div></section>" if sections['education'] else ''}
-    {f"<section class='skills'><h2>Skills</h2><div>{sections['skills']}</div></section>" if sections['skills'] else ''}
-    {f"<section><h2>Projects</h2><div>{sections['projects']}</div></section>" if sections['projects'] else ''}
-    {f"<section><h2>Certifications</h2><div>{sections['certs']}</div></section>" if sections['certs'] else ''}
+    {work_block}
+    {education_block}
+    {skills_block}
+    {projects_block}
+    {certs_block}
   </body>
 </html>
 """
-        return HTMLResponse(content=html)
-
-    # Template 1 – two-column maroon theme matching provided PDF
-    if "template1" in tname:
-        primary = "#7a1d12"  # deep maroon
-        dark = "#111111"
-        light = "#f8f5f2"
-        dot = "#b45309"  # amber-brown dots
-        html = f"""
+
+# Template 1 – two-column maroon theme matching provided PDF
+_TMPL_TEMPLATE1 = """
 <!doctype html>
 <html>
   <head>
     <meta charset='utf-8'/>
     <title>Resume - {name}</title>
     <style>
-      * {{ box-sizing: border-box; }}
+      {base_css}
       body {{ margin:0; font-family: Georgia, 'Times New Roman', serif; color:#1f2937; background:{light}; }}
       .header {{ background:{dark}; color:#fff; padding:16px 28px; border-bottom:6px solid {primary}; }}
       .name {{ font-weight:900; font-size:36px; letter-spacing:.02em; }}
@@ -457,9 +455,9 @@ def render_html_from_data(data: Dict, template: str | None = None) -> HTMLRespon
         <span>{email}</span><span class='dot'></span>
         <span>{phone}</span><span class='dot'></span>
         <span>{location}</span>
-        {f"<span class='dot'></span><span>{ln_html}</span>" if ln_html else ''}
-        {f"<span class='dot'></span><span>{gh_html}</span>" if gh_html else ''}
-        {f"<span class='dot'></span><span>{ws_html}</span>" if ws_html else ''}
+        {ln_block}
+        {gh_block}
+        {ws_block}
       </div>
     </div>
     <div class='wrap'>
@@ -467,17 +465,17 @@ def render_html_from_data(data: Dict, template: str | None = None) -> HTMLRespon
         <div>
           <h2>Experience</h2>
           <div class='section'>
-            {sections['work'] or ''}
+            {work}
           </div>
           <h2>Projects</h2>
           <div class='section'>
-            {sections['projects'] or ''}
+            {projects}
           </div>
         </div>
         <div>
           <h2>Strengths</h2>
           <div class='section tags'>
-            {sections['skills'] or ''}
+            {skills}
           </div>
           <h2>Languages</h2>
           <div class='section'>
@@ -485,7 +483,7 @@ def render_html_from_data(data: Dict, template: str | None = None) -> HTMLRespon
           </div>
           <h2>Education</h2>
           <div class='section'>
-            {sections['education'] or ''}
+            {education}
           </div>
         </div>
       </div>
@@ -493,47 +491,235 @@ def render_html_from_data(data: Dict, template: str | None = None) -> HTMLRespon
   </body>
 </html>
 """
-        return HTMLResponse(content=html)
 
-    # Default: billryan_basic-like
-    html = f"""
+# Default: billryan_basic-like
+_TMPL_DEFAULT = """
 <!doctype html>
 <html>
   <head>
     <meta charset='utf-8'/>
     <title>Resume - {name}</title>
     <style>
-      body {{ font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; margin: 40px auto; max-width: 820px; color:#333; line-height:1.6; }}
+      {base_css}
       .head {{ text-align:center; }}
       .head h1 {{ margin:0 0 6px; font-size:36px; font-weight:600; color:#223; }}
       .muted {{ color:#666; }}
       .rule {{ border-top:2px solid #2c3e50; margin:22px 0; }}
       h2 {{ margin:18px 0 10px; font-size:16px; letter-spacing:.06em; text-transform:uppercase; color:#2c3e50; }}
-      .skills {{ display:flex; flex-wrap:wrap; gap:8px; }}
       .skill {{ background:#eef2f7; padding:4px 10px; border-radius:14px; font-size:12px; }}
-      .item {{ margin:10px 0; }}
-      .ititle {{ margin-bottom:4px; }}
     </style>
   </head>
   <body>
     <div class='head'>
       <h1>{name}</h1>
-      <div class='muted'>{email} · {phone} · {location}{' · ' + ln_html if ln_html else ''}{' · ' + gh_html if gh_html else ''}{' · ' + ws_html if ws_html else ''}</div>
+      <div class='muted'>{contact_line}</div>
       <div class='rule'></div>
     </div>
     <h2>Professional Summary</h2>
     <div>{summary}</div>
-    {f"<h2>Work Experience</h2><div>{sections['work']}</div>" if sections['work'] else ''}
-    {f"<h2>Education</h2><div>{sections['education']}</div>" if sections['education'] else ''}
-    {f"<h2>Skills</h2><div class='skills'>{sections['skills']}</div>" if sections['skills'] else ''}
-    {f"<h2>Projects</h2><div>{sections['projects']}</div>" if sections['projects'] else ''}
-    {f"<h2>Certifications</h2><div>{sections['certs']}</div>" if sections['certs'] else ''}
+    {work_block}
+    {education_block}
+    {skills_block}
+    {projects_block}
+    {certs_block}
   </body>
 </html>
 """
-    return HTMLResponse(content=html)
 
+# Template CSS is format-escaped: rule braces are doubled, single braces are fields such as {primary}
+_CSS_SPACE_RE = re.compile(r"\s*(\{\{|\}\}|;)\s*")
+_HTML_COMMENT_RE = re.compile(r"<!--.*?-->", re.S)
+_INDENT_RE = re.compile(r"\n\s+")
+_STYLE_RE = re.compile(r"(<style>)(.*?)(</style>)", re.S)
+
+
+def _minify_css(css: str) -> str:
+    """Collapse whitespace in a template's CSS and drop it around rule braces and semicolons."""
+    return _CSS_SPACE_RE.sub(r"\1", " ".join(css.split()))
+
+
+def _minify_html(html: str) -> str:
+    """Shrink a template shell once at import: minify <style> blocks, drop HTML comments and
+    indentation. Runs of whitespace between tags stay as one newline, so rendering is unchanged."""
+    html = _STYLE_RE.sub(lambda m: m.group(1) + _minify_css(m.group(2)) + m.group(3), html)
+    return _INDENT_RE.sub("\n", _HTML_COMMENT_RE.sub("", html)).strip()
+
+
+_TMPL_MODERN_EXEC = _minify_html(_TMPL_MODERN_EXEC)
+_TMPL_BILLRYAN_MODERN = _minify_html(_TMPL_BILLRYAN_MODERN)
+_TMPL_CLASSIC = _minify_html(_TMPL_CLASSIC)
+_TMPL_MINIMAL = _minify_html(_TMPL_MINIMAL)
+_TMPL_TEMPLATE1 = _minify_html(_TMPL_TEMPLATE1)
+_TMPL_DEFAULT = _minify_html(_TMPL_DEFAULT)
+
+# CSS rules shared verbatim between themes, injected through each theme's {base_css} field
+# (inlined verbatim, so they are written pre-minified)
+_BORDER_BOX_CSS = "*{box-sizing: border-box;}"
+_ITEM_CSS = ".item{margin:10px 0;}"
+_SANS_PAGE_CSS = "".join((
+    "body{font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;margin: 40px auto;max-width: 820px;color:#333;line-height:1.6;}",
+    ".skills{display:flex; flex-wrap:wrap; gap:8px;}",
+    _ITEM_CSS,
+    ".ititle{margin-bottom:4px;}",
+))
+
+# Wrappers for optional blocks; each is filled with the section (or link) HTML, or left out when empty
+_H2_BLOCKS = {
+    "work": "<h2>Work Experience</h2><div>{}</div>",
+    "education": "<h2>Education</h2><div>{}</div>",
+    "skills": "<h2>Skills</h2><div>{}</div>",
+    "projects": "<h2>Projects</h2><div>{}</div>",
+    "certs": "<h2>Certifications</h2><div>{}</div>",
+}
+_SECTION_BLOCKS = {key: f"<section>{wrap}</section>" for key, wrap in _H2_BLOCKS.items()}
+
+# Template name -> (HTML shell, static fields such as colours and shared CSS, block wrappers)
+_HTML_THEMES = {
+    "modern_executive": (
+        _TMPL_MODERN_EXEC,
+        {"primary": "#1f2937", "accent": "#4f46e5", "base_css": _BORDER_BOX_CSS + _ITEM_CSS},  # slate-800, indigo-600
+        {
+            "work": _SECTION_BLOCKS["work"],
+            "projects": _SECTION_BLOCKS["projects"],
+            "education": _SECTION_BLOCKS["education"],
+            "skills": "<div class='side-block'><div class='sb-title'>Skills</div><div>{}</div></div>",
+            "certs": "<div class='side-block'><div class='sb-title'>Certifications</div><div>{}</div></div>",
+            "ln": "<li>{}</li>",
+            "gh": "<li>{}</li>",
+            "ws": "<li>{}</li>",
+        },
+    ),
+    "billryan_modern": (
+        _TMPL_BILLRYAN_MODERN,
+        {"primary": "#2c3e50", "base_css": _SANS_PAGE_CSS},
+        {**_H2_BLOCKS, "skills": "<h2>Skills</h2><div class='skills'>{}</div>"},
+    ),
+    "classic_professional": (_TMPL_CLASSIC, {"primary": "#0f172a"}, _H2_BLOCKS),
+    "minimal_clean": (
+        _TMPL_MINIMAL,
+        {},
+        {**_SECTION_BLOCKS, "skills": "<section class='skills'><h2>Skills</h2><div>{}</div></section>"},
+    ),
+    "template1": (
+        _TMPL_TEMPLATE1,
+        {"primary": "#7a1d12", "dark": "#111111", "light": "#f8f5f2", "base_css": _BORDER_BOX_CSS},  # deep maroon
+        {
+            "ln": "<span class='dot'></span><span>{}</span>",
+            "gh": "<span class='dot'></span><span>{}</span>",
+            "ws": "<span class='dot'></span><span>{}</span>",
+        },
+    ),
+}
+_HTML_DEFAULT_THEME = (
+    _TMPL_DEFAULT,
+    {"base_css": _SANS_PAGE_CSS},
+    {**_H2_BLOCKS, "skills": "<h2>Skills</h2><div class='skills'>{}</div>"},
+)
+
+
+def _fstring_literal(text: str) -> str:
+    """Escape literal text for the body of a generated single-quoted f-string."""
+    return (text.replace("\\", "\\\\").replace("'", "\\'").replace("\n", "\\n")
+            .replace("{", "{{").replace("}", "}}"))
+
+
+def _compile_renderer(fn_name: str, shell: str, static: Dict[str, str], wrappers: Dict[str, str]):
+    """Generate a theme's renderer at import time: static fields (colours, shared CSS) are inlined
+    into the literal text, block wrappers become conditional f-strings, and the whole page is one
+    f-string over locals pulled from the render context."""
+    body: List[str] = []
+    needed: List[str] = []
+    for literal, field, spec, conversion in string.Formatter().parse(shell):
+        body.append(_fstring_literal(literal))
+        if field is None:
+            continue
+        if spec or conversion:
+            raise ValueError(f"HTML template field {{{field}}} may not use a format spec or conversion")
+        if field in static:
+            body.append(_fstring_literal(static[field]))
+            continue
+        body.append("{" + field + "}")
+        if field not in needed:
+            needed.append(field)
+    lines = [f"def {fn_name}(ctx):"]
+    for field in needed:
+        key = field[:-len("_block")] if field.endswith("_block") else None
+        if key in wrappers:
+            pre, post = (_fstring_literal(part) for part in wrappers[key].split("{}"))
+            lines.append(f"    {key}_value = ctx[{key!r}]")
+            lines.append(f"    {field} = f'{pre}{{{key}_value}}{post}' if {key}_value else ''")
+        else:
+            lines.append(f"    {field} = ctx[{field!r}]")
+    lines.append(f"    return f'{''.join(body)}'")
+    namespace: Dict[str, object] = {}
+    exec(compile("\n".join(lines), f"<render:{fn_name}>", "exec"), namespace)
+    return namespace[fn_name]
+
+
+_RENDERERS = {key: _compile_renderer(f"_render_{key}", *theme) for key, theme in _HTML_THEMES.items()}
+_render_default = _compile_renderer("_render_default", *_HTML_DEFAULT_THEME)
+
+
+def _html_renderer(template: str | None):
+    """Pick a renderer by template name ("modern_executive", "minimal_clean.tex", ...).
+    Exact names are a dict hit; otherwise fall back to the old substring match."""
+    tname = (template or "billryan_basic").lower()
+    renderer = _RENDERERS.get(os.path.splitext(os.path.basename(tname))[0])
+    if renderer is None:
+        renderer = next((r for key, r in _RENDERERS.items() if key in tname), _render_default)
+    return renderer
+
+
+# personalInfo key, expected domain (None = any site), profile prefix for bare handles
+_URL_SPECS = (
+    ("linkedin", "linkedin.com", "https://linkedin.com/in/"),
+    ("github", "github.com", "https://github.com/"),
+    ("website", None, None),
+)
+
+
+def _anchor(raw: str | None, domain: str | None, prefix: str | None) -> str:
+    """Normalize a profile link once and return the escaped <a> tag, or "" when there is no link."""
+    raw = (raw or "").strip()
+    if not raw:
+        return ""
+    url = raw if raw.startswith(_URL_SCHEMES) else "https://" + raw
+    if domain and domain not in url:
+        # allow plain handle like aaryan-gole
+        url = prefix + raw
+    url = _html_escape(url)
+    return f'<a href="{url}" target="_blank" rel="noopener">{url}</a>'
 
+
+def render_html_from_data(data: Dict, template: str | None = None) -> HTMLResponse:
+    """Render HTML preview with themes approximating the LaTeX templates."""
+    p = data.get("personalInfo", {})
+    name = _html_escape(p.get("name", "Your Name"))
+    email = _html_escape(p.get("email", "your.email@example.com"))
+    phone = _html_escape(p.get("phone", "(123) 456-7890"))
+    location = _html_escape(p.get("location", "City, State"))
+    ln_html, gh_html, ws_html = (_anchor(p.get(key), domain, prefix) for key, domain, prefix in _URL_SPECS)
+    summary = _html_escape(data.get("summary", "Professional summary goes here."))
+
+    # Everything theme-independent is computed once; the chosen renderer does the rest
+    ctx = {
+        **_html_sections_from_data(data),
+        "name": name,
+        "email": email,
+        "phone": phone,
+        "location": location,
+        "summary": summary,
+        "ln": ln_html,
+        "gh": gh_html,
+        "ws": ws_html,
+        "contact_line": " · ".join(filter(None, (email, phone, location, ln_html, gh_html, ws_html))),
+    }
+    return HTMLResponse(content=_html_renderer(template)(ctx))
+
+
+# Executable lookups stat() several paths, so they are resolved once per process.
+# Call .cache_clear() on them after installing a TeX distribution into a running server.
+@functools.lru_cache(maxsize=1)
 def _find_pdflatex_executable() -> str | None:
     candidates = [
         'pdflatex',
@@ -547,7 +733,92 @@ def _find_pdflatex_executable() -> str | None:
     return None
 
 
-def render_pdf_from_template(template_name: str, data: Dict) -> StreamingResponse:
+@functools.lru_cache(maxsize=1)
+def _find_xelatex_executable() -> str | None:
+    # Common MiKTeX install locations
+    candidates = [
+        os.path.expandvars(r"%LocalAppData%\Programs\MiKTeX\miktex\bin\x64\xelatex.exe"),
+        os.path.expandvars(r"%ProgramFiles%\MiKTeX\miktex\bin\x64\xelatex.exe"),
+    ]
+    for c in candidates:
+        if os.path.isfile(c):
+            return c
+    return None
+
+
+# .aux entries that only resolve on a second LaTeX run (labels, citations). Every numbered
+# \section also writes a \@writefile{toc} line, but that only matters when the document
+# has a \tableofcontents, which is what creates the .toc file checked below.
+_AUX_RERUN_MARKERS = (b"\\newlabel", b"\\bibcite")
+
+
+def _needs_second_pass(aux_file: str) -> bool:
+    if os.path.exists(os.path.splitext(aux_file)[0] + ".toc"):
+        return True
+    try:
+        with open(aux_file, 'rb') as f:
+            aux = f.read()
+    except OSError:
+        return False
+    return any(marker in aux for marker in _AUX_RERUN_MARKERS)
+
+
+def _run_latex(engine: str, tex_file: str, output_dir: str) -> Tuple[bool, str]:
+    """Compile tex_file with `engine`; returns (pdf produced, stderr of all passes).
+    A second pass only runs when the first failed (e.g. to let MiKTeX finish installing
+    packages) or when the .aux file has cross-references to resolve."""
+    args = [
+        engine,
+        '-interaction=nonstopmode',
+        '-halt-on-error',
+        '-output-directory', output_dir,
+        tex_file,
+    ]
+    results = [subprocess.run(args, capture_output=True, text=True, timeout=120)]
+    base = os.path.join(output_dir, os.path.splitext(os.path.basename(tex_file))[0])
+    if results[0].returncode != 0 or _needs_second_pass(base + ".aux"):
+        results.append(subprocess.run(args, capture_output=True, text=True, timeout=120))
+    ok = os.path.exists(base + ".pdf") and any(r.returncode == 0 for r in results)
+    return ok, "\n".join(r.stderr or '' for r in results)
+
+
+def _unlink_quietly(path: str) -> None:
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+class _TempFileResponse(FileResponse):
+    """FileResponse that deletes its file when the response ends. A background task would only
+    run after a complete send, so a client disconnect or an early error reply (e.g. a malformed
+    Range header) would leave the file behind."""
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            _unlink_quietly(self.path)
+
+
+def _pdf_file_response(pdf_file: str) -> FileResponse:
+    """Move the compiled PDF out of the build directory (which is about to be deleted) and
+    stream it from disk; the copy is removed once the response is done."""
+    fd, path = tempfile.mkstemp(suffix=".pdf")
+    os.close(fd)
+    try:
+        shutil.move(pdf_file, path)
+        return _TempFileResponse(
+            path,
+            media_type="application/pdf",
+            headers={"Content-Disposition": "attachment; filename=resume.pdf"},
+        )
+    except Exception:
+        _unlink_quietly(path)
+        raise
+
+
+def render_pdf_from_template(template_name: str, data: Dict) -> FileResponse | StreamingResponse:
     """Render PDF using LaTeX template"""
     try:
         # Find template file
@@ -556,22 +827,20 @@ def render_pdf_from_template(template_name: str, data: Dict) -> StreamingRespons
             os.path.join(os.path.dirname(os.path.dirname(__file__)), "templates", template_name)
         ]
         
-        template_path = None
-        for path in template_paths:
-            if os.path.exists(path):
-                template_path = path
+        # One stat per candidate both finds the template and yields the mtime for the cache key
+        for template_path in template_paths:
+            try:
+                mtime_ns = os.stat(template_path).st_mtime_ns
                 break
-        
-        if not template_path:
+            except OSError:
+                continue
+        else:
             # Fallback to placeholder
             return render_pdf_placeholder()
         
-        # Read template
-        with open(template_path, 'r', encoding='utf-8') as f:
-            template_content = f.read()
-        
-        # Substitute variables
-        latex_content = substitute_template_variables(template_content, data)
+        # Load (cached) pre-split template and substitute variables
+        template = _load_template(template_path, mtime_ns)
+        latex_content = substitute_template_variables(template, data)
         
         # Create temporary files
         with tempfile.TemporaryDirectory() as temp_dir:
@@ -585,61 +854,21 @@ def render_pdf_from_template(template_name: str, data: Dict) -> StreamingRespons
             # Compile LaTeX to PDF
             try:
                 pdflatex = _find_pdflatex_executable() or 'pdflatex'
-                args = [
-                    pdflatex,
-                    '-interaction=nonstopmode',
-                    '-halt-on-error',
-                    '-output-directory', temp_dir,
-                    tex_file,
-                ]
-                # First pass
-                result1 = subprocess.run(args, capture_output=True, text=True, timeout=120)
-                # Second pass (often needed for TOC/refs, and also to trigger package auto-install once more)
-                result2 = subprocess.run(args, capture_output=True, text=True, timeout=120)
-
-                if os.path.exists(pdf_file) and (result2.returncode == 0 or result1.returncode == 0):
-                    with open(pdf_file, 'rb') as f:
-                        pdf_content = f.read()
-                    return StreamingResponse(
-                        BytesIO(pdf_content),
-                        media_type="application/pdf",
-                        headers={"Content-Disposition": "attachment; filename=resume.pdf"}
-                    )
+                ok, pdflatex_err = _run_latex(pdflatex, tex_file, temp_dir)
+
+                if ok:
+                    return _pdf_file_response(pdf_file)
                 else:
                     # Fallback to xelatex if pdflatex failed
-                    combined_err = (result1.stderr or '') + "\n" + (result2.stderr or '')
-                    print(f"LaTeX compilation failed with pdflatex, trying xelatex...\n{combined_err}")
-
-                    xelatex = 'xelatex'
-                    # Try common MiKTeX xelatex path as well
-                    for candidate in [
-                        os.path.expandvars(r"%LocalAppData%\Programs\MiKTeX\miktex\bin\x64\xelatex.exe"),
-                        os.path.expandvars(r"%ProgramFiles%\MiKTeX\miktex\bin\x64\xelatex.exe"),
-                    ]:
-                        if os.path.isfile(candidate):
-                            xelatex = candidate
-                            break
-
-                    args_xe = [
-                        xelatex,
-                        '-interaction=nonstopmode',
-                        '-halt-on-error',
-                        '-output-directory', temp_dir,
-                        tex_file,
-                    ]
+                    print(f"LaTeX compilation failed with pdflatex, trying xelatex...\n{pdflatex_err}")
+
+                    xelatex = _find_xelatex_executable() or 'xelatex'
                     try:
-                        r1 = subprocess.run(args_xe, capture_output=True, text=True, timeout=120)
-                        r2 = subprocess.run(args_xe, capture_output=True, text=True, timeout=120)
-                        if os.path.exists(pdf_file) and (r2.returncode == 0 or r1.returncode == 0):
-                            with open(pdf_file, 'rb') as f:
-                                pdf_content = f.read()
-                            return StreamingResponse(
-                                BytesIO(pdf_content),
-                                media_type="application/pdf",
-                                headers={"Content-Disposition": "attachment; filename=resume.pdf"}
-                            )
+                        ok, xelatex_err = _run_latex(xelatex, tex_file, temp_dir)
+                        if ok:
+                            return _pdf_file_response(pdf_file)
                         else:
-                            print(f"XeLaTeX compilation failed as well.\n{(r1.stderr or '')}\n{(r2.stderr or '')}")
+                            print(f"XeLaTeX compilation failed as well.\n{xelatex_err}")
                             return render_pdf_placeholder()
                     except (subprocess.TimeoutExpired, FileNotFoundError) as e:
                         print(f"XeLaTeX compilation error: {e}")
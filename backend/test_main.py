@@ -0,0 +1,150 @@
+import asyncio
+import io
+import os
+import unittest
+from unittest import mock
+
+# core.py refuses to import without a key; none of these endpoints call Gemini
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
+
+import docx
+import fitz
+from fastapi.testclient import TestClient
+
+import main
+import parser
+import render
+
+
+def make_pdf() -> bytes:
+    """PDF with a large-font name plus email and phone, so spaCy is not needed."""
+    with fitz.open() as doc:
+        page = doc.new_page()
+        page.insert_text((72, 72), "Jane Doe", fontsize=24)
+        page.insert_text((72, 110), "jane.doe@example.com | +1 555-123-4567", fontsize=10)
+        page.insert_text((72, 140), "Experience", fontsize=14)
+        page.insert_text((72, 160), "Backend developer working with Python and SQL", fontsize=10)
+        return doc.tobytes()
+
+
+def make_docx() -> bytes:
+    document = docx.Document()
+    document.add_paragraph("John Smith")
+    document.add_paragraph("john.smith@example.com")
+    document.add_paragraph("Education")
+    document.add_paragraph("Bachelor of Science, 2019")
+    buf = io.BytesIO()
+    document.save(buf)
+    return buf.getvalue()
+
+
+class UploadResumesTest(unittest.TestCase):
+    def setUp(self):
+        self.client = TestClient(main.app)
+
+    def test_mixed_batch(self):
+        files = [
+            ("files", ("jane.pdf", make_pdf(), "application/pdf")),
+            ("files", ("notes.txt", b"plain text", "text/plain")),
+            ("files", ("john.docx", make_docx(),
+                       "application/vnd.openxmlformats-officedocument.wordprocessingml.document")),
+        ]
+        with mock.patch.object(parser, "extract_with_spacy_batch",
+                               wraps=parser.extract_with_spacy_batch) as spacy_batch:
+            response = self.client.post("/upload_resumes", files=files)
+        self.assertEqual(response.status_code, 200)
+        results = response.json()["results"]
+
+        # One entry per upload, in upload order
+        self.assertEqual([r["filename"] for r in results], ["jane.pdf", "notes.txt", "john.docx"])
+
+        pdf, unsupported, word = results
+        self.assertEqual(pdf["parsed"]["personalInfo"]["name"], "Jane Doe")
+        self.assertEqual(pdf["parsed"]["personalInfo"]["email"], "jane.doe@example.com")
+        self.assertTrue(pdf["parsed"]["personalInfo"]["phone"])
+        self.assertEqual(unsupported, {"filename": "notes.txt", "error": "Unsupported file type: notes.txt"})
+        self.assertEqual(word["parsed"]["personalInfo"]["email"], "john.smith@example.com")
+        self.assertIn("Bachelor of Science", word["rawText"])
+
+        # Font name, email and phone were all found for the PDF, so it is not sent to spaCy;
+        # the DOCX has no font name and is.
+        spacy_batch.assert_called_once()
+        texts = spacy_batch.call_args.args[0]
+        self.assertEqual(texts[0], "")
+        self.assertEqual(texts[1], "")
+        self.assertIn("john.smith@example.com", texts[2])
+
+
+def fake_latex(engine, tex_file, output_dir):
+    """Stand-in for _run_latex: writes a PDF where pdflatex would."""
+    with open(os.path.join(output_dir, "resume.pdf"), "wb") as f:
+        f.write(b"%PDF-1.4 test")
+    return True, ""
+
+
+class PdfDownloadTest(unittest.TestCase):
+    def setUp(self):
+        self.responses = []
+        pdf_file_response = render._pdf_file_response
+
+        def record(pdf_file):
+            response = pdf_file_response(pdf_file)
+            self.responses.append(response)
+            return response
+
+        patches = [
+            mock.patch.object(render, "_run_latex", fake_latex),
+            mock.patch.object(render, "_pdf_file_response", record),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def generate(self):
+        return render.render_pdf_from_template("billryan_basic.tex", {"personalInfo": {"name": "Jane Doe"}})
+
+    def test_temp_file_removed_after_download(self):
+        client = TestClient(main.app)
+        response = client.post("/generate_resume", json={
+            "template": "billryan_basic.tex",
+            "format": "pdf",
+            "data": {"personalInfo": {"name": "Jane Doe"}},
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, b"%PDF-1.4 test")
+        self.assertEqual(len(self.responses), 1)
+        self.assertFalse(os.path.exists(self.responses[0].path))
+
+    def test_temp_file_removed_when_send_fails(self):
+        response = self.generate()
+        self.assertTrue(os.path.exists(response.path))
+
+        async def receive():
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            raise OSError("client disconnected")
+
+        scope = {"type": "http", "method": "GET", "headers": []}
+        with self.assertRaises(OSError):
+            asyncio.run(response(scope, receive, send))
+        self.assertFalse(os.path.exists(response.path))
+
+    def test_temp_file_removed_when_response_cannot_be_built(self):
+        created = []
+        real_mkstemp = render.tempfile.mkstemp
+
+        def mkstemp(*args, **kwargs):
+            fd, path = real_mkstemp(*args, **kwargs)
+            created.append(path)
+            return fd, path
+
+        with mock.patch.object(render.tempfile, "mkstemp", mkstemp), \
+                mock.patch.object(render, "_TempFileResponse", side_effect=RuntimeError("boom")):
+            self.generate()
+        self.assertEqual(len(created), 1)
+        self.assertFalse(os.path.exists(created[0]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import itertools
+import unittest
+from unittest import mock
+
+import parser
+from parser import _EDU_KEYWORDS, _EXP_KEYWORDS, _section_type, extract_experience_sections
+
+
+def substring_section_type(line_lower):
+    """Reference rule: any keyword as a substring, experience keywords checked first."""
+    if any(k in line_lower for k in _EXP_KEYWORDS):
+        return 'experience'
+    if any(k in line_lower for k in _EDU_KEYWORDS):
+        return 'education'
+    return None
+
+
+# Keywords, their fragments and concatenations (overlaps such as "educationexperience")
+SAMPLE_WORDS = list(_EXP_KEYWORDS + _EDU_KEYWORDS) + [
+    "experienc", "work", "history", "educat", "degree", "academy", "professional",
+    "workhistory", "educationexperience", "degreesemployment", "skills", "", "2019",
+]
+
+
+class SectionTypeTest(unittest.TestCase):
+    def lines(self):
+        for a, b in itertools.product(SAMPLE_WORDS, repeat=2):
+            yield a + b
+            yield f"{a} {b}"
+            yield f"{a} & {b}:"
+
+    def test_agrees_with_substring_rule(self):
+        for line in self.lines():
+            self.assertEqual(_section_type(line), substring_section_type(line), line)
+
+    def test_fallback_agrees_with_substring_rule(self):
+        with mock.patch.object(parser, "_SECTION_AC", None):
+            for line in self.lines():
+                self.assertEqual(_section_type(line), substring_section_type(line), line)
+
+    def test_experience_wins(self):
+        self.assertEqual(_section_type("education and work experience"), 'experience')
+        self.assertEqual(_section_type("academic employment"), 'experience')
+        self.assertEqual(_section_type("degrees"), 'education')
+        self.assertIsNone(_section_type("skills"))
+
+
+class ExperienceSectionsTest(unittest.TestCase):
+    def test_sections(self):
+        text = "Jane Doe\nWork Experience\nAcme Corp\n2019 - 2021\nEducation\nBachelor of Science\n2018"
+        self.assertEqual(extract_experience_sections(text), [
+            {'type': 'experience', 'title': 'Work Experience', 'content': "Acme Corp\n2019 - 2021\n"},
+            {'type': 'education', 'title': 'Education', 'content': "Bachelor of Science\n2018\n",
+             'degree': 'bachelor', 'year': '2018'},
+        ])
+
+
+if __name__ == "__main__":
+    unittest.main()
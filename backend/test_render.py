@@ -0,0 +1,136 @@
+import os
+import tempfile
+import unittest
+
+from render import (
+    _latex_escape,
+    _needs_second_pass,
+    format_github_url,
+    format_linkedin_url,
+    format_website_url,
+)
+
+
+# .aux written by pdflatex for a generated resume: numbered sections, nothing to resolve
+RESUME_AUX = (
+    "\\relax \n"
+    "\\@writefile{toc}{\\contentsline {section}{\\numberline {1}Work Experience}{1}{}\\protected@file@percent }\n"
+    "\\@writefile{toc}{\\contentsline {section}{\\numberline {2}Education}{1}{}\\protected@file@percent }\n"
+    "\\gdef \\@abspage@last{1}\n"
+)
+
+# Payloads that try to close the \href URL argument and run their own TeX
+URL_PAYLOADS = [
+    "x}\\input{/etc/passwd}",
+    "https://example.com/}{Click}\\input{/etc/passwd}",
+    "\\immediate\\write18{rm -rf ~}",
+    "a\\}b{",
+    "jane\\",
+    "example.com/#frag%20 \n\\end{document}",
+]
+
+
+def href_url_argument(tex):
+    """Split "\\href{url}{label}" the way TeX groups it; returns (url, rest after the group)."""
+    assert tex.startswith("\\href{"), tex
+    depth = 1
+    i = len("\\href{")
+    while i < len(tex):
+        c = tex[i]
+        if c == "\\":
+            i += 2
+            continue
+        if c == "{":
+            depth += 1
+        elif c == "}":
+            depth -= 1
+            if depth == 0:
+                return tex[len("\\href{"):i], tex[i + 1:]
+        i += 1
+    raise AssertionError(f"unterminated \\href argument: {tex}")
+
+
+class NeedsSecondPassTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.aux_file = os.path.join(self.tmp.name, "resume.aux")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, name, content):
+        with open(os.path.join(self.tmp.name, name), "w") as f:
+            f.write(content)
+
+    def test_section_toc_lines_do_not_rerun(self):
+        self.write("resume.aux", RESUME_AUX)
+        self.assertFalse(_needs_second_pass(self.aux_file))
+
+    def test_labels_rerun(self):
+        self.write("resume.aux", RESUME_AUX + "\\newlabel{sec:skills}{{3}{1}}\n")
+        self.assertTrue(_needs_second_pass(self.aux_file))
+
+    def test_citations_rerun(self):
+        self.write("resume.aux", RESUME_AUX + "\\bibcite{knuth}{1}\n")
+        self.assertTrue(_needs_second_pass(self.aux_file))
+
+    def test_table_of_contents_reruns(self):
+        self.write("resume.aux", RESUME_AUX)
+        self.write("resume.toc", "")
+        self.assertTrue(_needs_second_pass(self.aux_file))
+
+    def test_missing_aux(self):
+        self.assertFalse(_needs_second_pass(self.aux_file))
+
+
+class LatexEscapeTest(unittest.TestCase):
+    def test_special_characters(self):
+        self.assertEqual(_latex_escape("&"), "\\&")
+        self.assertEqual(_latex_escape("%"), "\\%")
+        self.assertEqual(_latex_escape("$"), "\\$")
+        self.assertEqual(_latex_escape("#"), "\\#")
+        self.assertEqual(_latex_escape("_"), "\\_")
+        self.assertEqual(_latex_escape("{"), "\\{")
+        self.assertEqual(_latex_escape("}"), "\\}")
+        self.assertEqual(_latex_escape("~"), "\\textasciitilde{}")
+        self.assertEqual(_latex_escape("^"), "\\textasciicircum{}")
+        self.assertEqual(_latex_escape("\\"), "\\textbackslash{}")
+
+    def test_mixed_text(self):
+        self.assertEqual(_latex_escape("R&D: 50% of $1M"), "R\\&D: 50\\% of \\$1M")
+        self.assertEqual(_latex_escape("}\\input{x}"), "\\}\\textbackslash{}input\\{x\\}")
+
+    def test_none(self):
+        self.assertEqual(_latex_escape(None), "")
+
+
+class HrefUrlTest(unittest.TestCase):
+    def check(self, formatter, label):
+        for payload in URL_PAYLOADS:
+            with self.subTest(payload=payload):
+                url, rest = href_url_argument(formatter(payload))
+                # The URL argument closes exactly where the builder put it, followed only by the label
+                self.assertEqual(rest, "{" + label + "}")
+                # No braces, whitespace or control sequences left inside it; only \# and \% escapes
+                self.assertNotRegex(url, r"[{}\s]")
+                self.assertEqual(url.replace("\\#", "").replace("\\%", "").count("\\"), 0)
+
+    def test_website(self):
+        self.check(format_website_url, "Website")
+
+    def test_linkedin(self):
+        self.check(format_linkedin_url, "LinkedIn")
+
+    def test_github(self):
+        self.check(format_github_url, "GitHub")
+
+    def test_full_urls_are_encoded_too(self):
+        self.assertEqual(
+            format_website_url("https://example.com/a}b\\c{d#e%f"),
+            "\\href{https://example.com/a%7Db%5Cc%7Bd\\#e\\%f}{Website}",
+        )
+        self.assertEqual(format_github_url("janedoe"), "\\href{https://github.com/janedoe}{GitHub}")
+
+
+if __name__ == "__main__":
+    unittest.main()